@@ -0,0 +1,11 @@
+import sys
+
+from pathlib import Path
+
+SOURCE = Path(__file__).resolve().parents[1] / "src"
+if str(SOURCE) not in sys.path:
+    sys.path.insert(0, str(SOURCE))
+
+from benchmarks.datasets import DATASETS, generateDataset, writeDataset
+
+__all__ = ["DATASETS", "generateDataset", "writeDataset"]
@@ -0,0 +1,83 @@
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+import tempfile
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from benchmarks.datasets import DATASETS, generateDataset, writeDataset
+from benchmarks.runner import runCase
+
+
+def parseArguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Headless benchmarks for PolygonCache and PolygonRepository"
+    )
+    parser.add_argument("--datasets", default=",".join(DATASETS))
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--backends", default="rtree,chunkGrid")
+    parser.add_argument("--dimensions", default="2")
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    return parser.parse_args()
+
+
+def main():
+    arguments = parseArguments()
+
+    datasets = arguments.datasets.split(",")
+    sizes = [int(size) for size in arguments.sizes.split(",")]
+    backends = arguments.backends.split(",")
+    dimensions = [int(dimension) for dimension in arguments.dimensions.split(",")]
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+
+    with tempfile.TemporaryDirectory() as folder:
+        for dataset in datasets:
+            for size in sizes:
+                database = Path(folder) / f"{dataset}-{size}.db"
+                writeDataset(generateDataset(dataset, size, arguments.seed), database)
+
+                for backend in backends:
+                    for dimension in (dimensions if backend == "rtree" else dimensions[:1]):
+                        case = {
+                            "dataset": dataset,
+                            "database": str(database),
+                            "backend": backend,
+                            "indexDimension": dimension,
+                            "queries": arguments.queries,
+                            "seed": arguments.seed
+                        }
+
+                        with ProcessPoolExecutor(1, mp_context=context) as executor:
+                            result = executor.submit(runCase, case).result()
+
+                        results.append(result)
+                        print(f"{dataset} {size} {backend}/{dimension}d: "
+                              f"load {result['load']['seconds']}s", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": arguments.seed,
+            "queries": arguments.queries
+        },
+        "results": results
+    }
+
+    text = json.dumps(report, indent=2)
+    if arguments.output:
+        Path(arguments.output).write_text(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import math
+import random
+
+from pathlib import Path
+
+from sqlalchemy import insert
+
+from endstone_polygons.database.engine import DatabaseEngine
+from endstone_polygons.database.models import Polygon, PolygonCoordinates, PolygonFlags, PolygonMember
+
+
+SLOT_SIZE = 40
+POLYGON_SIZES = (7, 9, 15, 21, 31)
+STACK_LAYERS = 8
+WORLDS = ("Overworld", "Nether", "TheEnd")
+
+DATASETS = ("uniform", "clustered", "stacked", "multiWorld")
+
+
+def _uniformSlots(count: int, rng: random.Random, occupancy: float = 0.5) -> list[tuple[int, int]]:
+    side = max(1, math.ceil(math.sqrt(count / occupancy)))
+    return [divmod(cell, side) for cell in rng.sample(range(side * side), count)]
+
+
+def _clusteredSlots(count: int, rng: random.Random) -> list[tuple[int, int]]:
+    hubs = [(rng.randint(-200, 200), rng.randint(-200, 200)) for _ in range(max(1, count // 500))]
+    spread = max(2.0, math.sqrt(count / len(hubs)) * 0.6)
+
+    slots = set()
+    while len(slots) < count:
+        hubX, hubZ = rng.choice(hubs)
+        slots.add((round(rng.gauss(hubX, spread)), round(rng.gauss(hubZ, spread))))
+    return list(slots)
+
+
+def _polygon(polygonId: int, world: str, slot: tuple[int, int], centerY: int, rng: random.Random) -> dict:
+    size = rng.choice(POLYGON_SIZES)
+    radius = size // 2
+    jitter = (SLOT_SIZE - size) // 2
+
+    centerX = slot[0] * SLOT_SIZE + SLOT_SIZE // 2 + rng.randint(-jitter, jitter)
+    centerZ = slot[1] * SLOT_SIZE + SLOT_SIZE // 2 + rng.randint(-jitter, jitter)
+
+    return {
+        "id": polygonId,
+        "world": world,
+        "center": (centerX, centerY, centerZ),
+        "bounds": (centerX - radius, centerY - radius, centerZ - radius,
+                   centerX + radius, centerY + radius, centerZ + radius)
+    }
+
+
+def generateDataset(kind: str, count: int, seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    polygons = []
+
+    if kind == "uniform":
+        for slot in _uniformSlots(count, rng):
+            polygons.append(_polygon(len(polygons) + 1, WORLDS[0], slot, rng.randint(40, 100), rng))
+
+    elif kind == "clustered":
+        for slot in _clusteredSlots(count, rng):
+            polygons.append(_polygon(len(polygons) + 1, WORLDS[0], slot, rng.randint(40, 100), rng))
+
+    elif kind == "stacked":
+        for slot in _uniformSlots(math.ceil(count / STACK_LAYERS), rng):
+            for layer in range(STACK_LAYERS):
+                if len(polygons) == count:
+                    break
+                polygons.append(_polygon(len(polygons) + 1, WORLDS[0], slot, -40 + layer * SLOT_SIZE, rng))
+
+    elif kind == "multiWorld":
+        perWorld = [count // len(WORLDS) + (1 if index < count % len(WORLDS) else 0) for index in range(len(WORLDS))]
+        for world, worldCount in zip(WORLDS, perWorld):
+            for slot in _uniformSlots(worldCount, rng):
+                polygons.append(_polygon(len(polygons) + 1, world, slot, rng.randint(40, 100), rng))
+
+    else:
+        raise ValueError(f"Unknown dataset: {kind}")
+
+    players = [f"player{index}" for index in range(max(2, count // 4))]
+    for polygon in polygons:
+        polygon["owner"] = rng.choice(players)
+        polygon["members"] = {rng.choice(players) for _ in range(rng.randint(0, 3))} - {polygon["owner"]}
+        polygon["flags"] = tuple(rng.random() < 0.2 for _ in range(3))
+
+    return polygons
+
+
+def writeDataset(polygons: list[dict], path: Path, batchSize: int = 5000):
+    config = {"database": {"type": "sqlite", "sqlite": {"filename": str(path)}}}
+    dbEngine = DatabaseEngine(config, str(path))
+    dbEngine.createTables()
+
+    session = dbEngine.getSession()
+    try:
+        for start in range(0, len(polygons), batchSize):
+            batch = polygons[start:start + batchSize]
+
+            session.execute(insert(Polygon), [
+                {"id": polygon["id"], "name": f"polygon{polygon['id']}",
+                 "owner": polygon["owner"], "world": polygon["world"]}
+                for polygon in batch
+            ])
+            session.execute(insert(PolygonCoordinates), [
+                dict(
+                    polygonId=polygon["id"],
+                    **dict(zip(("minX", "minY", "minZ", "maxX", "maxY", "maxZ"), polygon["bounds"])),
+                    **dict(zip(("centerX", "centerY", "centerZ"), polygon["center"]))
+                )
+                for polygon in batch
+            ])
+            session.execute(insert(PolygonFlags), [
+                dict(polygonId=polygon["id"], **dict(zip(("canBreak", "canPlace", "canOpenChests"), polygon["flags"])))
+                for polygon in batch
+            ])
+
+            members = [
+                {"polygonId": polygon["id"], "playerName": member}
+                for polygon in batch for member in polygon["members"]
+            ]
+            if members:
+                session.execute(insert(PolygonMember), members)
+
+        session.commit()
+    finally:
+        session.close()
+        dbEngine.close()
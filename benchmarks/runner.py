@@ -0,0 +1,192 @@
+import gc
+import logging
+import os
+import random
+import sys
+import time
+
+from typing import Callable, Optional
+
+from benchmarks.datasets import POLYGON_SIZES
+
+
+def currentRss() -> Optional[int]:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peakRss() -> Optional[int]:
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset
+    except (ImportError, AttributeError):
+        return None
+
+
+def megabytes(value: Optional[int]) -> Optional[float]:
+    return round(value / 1024 / 1024, 2) if value is not None else None
+
+
+def measure(calls: list[tuple], function: Callable) -> dict:
+    durations = []
+    clock = time.perf_counter_ns
+
+    gc.disable()
+    try:
+        started = clock()
+        for args in calls:
+            start = clock()
+            function(*args)
+            durations.append(clock() - start)
+        total = clock() - started
+    finally:
+        gc.enable()
+
+    durations.sort()
+    count = len(durations)
+    return {
+        "operations": count,
+        "p50Us": round(durations[count // 2] / 1000, 3),
+        "p99Us": round(durations[min(count - 1, count * 99 // 100)] / 1000, 3),
+        "meanUs": round(sum(durations) / count / 1000, 3),
+        "opsPerSecond": round(count / (total / 1e9))
+    }
+
+
+def _samplePositions(polygons: list, rng: random.Random, count: int) -> list[tuple]:
+    extents = {}
+    for polygon in polygons:
+        minX, minZ, maxX, maxZ = extents.get(polygon.world, (polygon.minX, polygon.minZ, polygon.maxX, polygon.maxZ))
+        extents[polygon.world] = (min(minX, polygon.minX), min(minZ, polygon.minZ),
+                                  max(maxX, polygon.maxX), max(maxZ, polygon.maxZ))
+
+    positions = []
+    for index in range(count):
+        if index % 2 == 0:
+            polygon = rng.choice(polygons)
+            positions.append((polygon.world,
+                              rng.uniform(polygon.minX, polygon.maxX),
+                              rng.uniform(polygon.minY, polygon.maxY),
+                              rng.uniform(polygon.minZ, polygon.maxZ)))
+        else:
+            world = rng.choice(list(extents))
+            minX, minZ, maxX, maxZ = extents[world]
+            positions.append((world, rng.uniform(minX, maxX), rng.uniform(-64, 320), rng.uniform(minZ, maxZ)))
+
+    return positions
+
+
+def _walkingPlayers(positions: list[tuple], rng: random.Random, players: int = 100) -> list[tuple]:
+    steps = len(positions) // players
+    calls = []
+    for index in range(players):
+        world, x, y, z = positions[index]
+        for _ in range(steps):
+            x += rng.uniform(-1, 1)
+            z += rng.uniform(-1, 1)
+            calls.append((f"walker{index}", world, x, z, y))
+
+    rng.shuffle(calls)
+    calls.sort(key=lambda call: call[0])
+    return calls
+
+
+def runCase(case: dict) -> dict:
+    from endstone_polygons.cache import PolygonCache
+    from endstone_polygons.database.engine import DatabaseEngine
+    from endstone_polygons.database.repository import PolygonRepository
+
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.WARNING)
+
+    config = {
+        "database": {"type": "sqlite", "sqlite": {"filename": case["database"]}},
+        "cache": {"backend": case["backend"], "indexDimension": case["indexDimension"], "chunkSize": 16}
+    }
+
+    dbEngine = DatabaseEngine(config, case["database"])
+    cache = PolygonCache(logger, config)
+
+    gc.collect()
+    rssBefore = currentRss()
+
+    session = dbEngine.getSession()
+    started = time.perf_counter()
+    cache.loadFromDatabase(PolygonRepository(session))
+    loadSeconds = time.perf_counter() - started
+    session.close()
+
+    gc.collect()
+    rssAfter = currentRss()
+
+    rng = random.Random(case["seed"])
+    polygons = list(cache.polygons.values())
+    queries = case["queries"]
+
+    positions = _samplePositions(polygons, rng, queries)
+
+    boxes = []
+    for world, x, y, z in positions:
+        radius = rng.choice(POLYGON_SIZES) // 2
+        boxes.append((world, int(x) - radius, int(y) - radius, int(z) - radius,
+                      int(x) + radius, int(y) + radius, int(z) + radius))
+
+    owners = [(rng.choice(polygons).owner,) for _ in range(queries)]
+
+    permissionCalls = []
+    strangers = [f"stranger{index}" for index in range(50)]
+    for _ in range(queries):
+        polygon = rng.choice(polygons)
+        roll = rng.random()
+        if roll < 0.2:
+            player = polygon.owner
+        elif roll < 0.4 and polygon.members:
+            player = rng.choice(sorted(polygon.members))
+        else:
+            player = rng.choice(strangers)
+        permissionCalls.append((polygon, player))
+
+    operations = {
+        "findPolygonAtPosition": measure(
+            [(world, x, z, y) for world, x, y, z in positions], cache.findPolygonAtPosition
+        ),
+        "findPolygonForPlayer": measure(_walkingPlayers(positions, rng), cache.findPolygonForPlayer),
+        "checkIntersection": measure(boxes, cache.checkIntersection),
+        "getPolygonsByOwner": measure(owners, cache.getPolygonsByOwner),
+        "canBreak": measure(permissionCalls, cache.canBreak),
+        "canPlace": measure(permissionCalls, cache.canPlace),
+        "canOpenChests": measure(permissionCalls, cache.canOpenChests)
+    }
+
+    cache.close()
+    dbEngine.close()
+
+    return {
+        "dataset": case["dataset"],
+        "polygons": len(polygons),
+        "backend": case["backend"],
+        "indexDimension": case["indexDimension"],
+        "load": {
+            "seconds": round(loadSeconds, 4),
+            "polygonsPerSecond": round(len(polygons) / loadSeconds) if loadSeconds else None,
+            "rssDeltaMb": megabytes(rssAfter - rssBefore) if rssBefore is not None else None
+        },
+        "operations": operations,
+        "peakRssMb": megabytes(peakRss())
+    }
@@ -0,0 +1,37 @@
+from endstone_polygons.cache.polygonCache import PolygonCache
+from endstone_polygons.cache.changePoller import ChangePoller
+from endstone_polygons.cache.onlinePlayers import OnlinePlayerIndex
+from endstone_polygons.cache.polygonRecord import (
+    PolygonRecord,
+    FLAG_BREAK,
+    FLAG_PLACE,
+    FLAG_OPEN_CHESTS,
+    FLAG_EXPLOSIONS
+)
+from endstone_polygons.cache.snapshot import CacheSnapshot
+from endstone_polygons.cache.tileCache import TileCache
+from endstone_polygons.cache.spatialBackend import (
+    SpatialBackend,
+    RTreeBackend,
+    ChunkGridBackend,
+    TiledBackend,
+    createSpatialBackend
+)
+
+__all__ = [
+    "PolygonCache",
+    "PolygonRecord",
+    "CacheSnapshot",
+    "TileCache",
+    "ChangePoller",
+    "OnlinePlayerIndex",
+    "FLAG_BREAK",
+    "FLAG_PLACE",
+    "FLAG_OPEN_CHESTS",
+    "FLAG_EXPLOSIONS",
+    "SpatialBackend",
+    "RTreeBackend",
+    "ChunkGridBackend",
+    "TiledBackend",
+    "createSpatialBackend"
+]
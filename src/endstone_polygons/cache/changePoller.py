@@ -0,0 +1,114 @@
+import threading
+import time
+
+from datetime import datetime, timedelta
+from functools import partial
+
+from endstone.plugin import Plugin
+
+from .polygonCache import PolygonCache
+
+from ..database.engine import DatabaseEngine
+from ..database.repository import PolygonRepository
+
+
+PRUNE_INTERVAL = 600
+
+
+class ChangePoller:
+    def __init__(self, plugin: Plugin, dbEngine: DatabaseEngine, cache: PolygonCache,
+                 interval: float = 5.0, retention: float = 3600.0,
+                 gapTimeout: float = 30.0, batchSize: int = 1000):
+        self._plugin = plugin
+        self._dbEngine = dbEngine
+        self._cache = cache
+
+        self.interval = interval
+        self.retention = retention
+        self.gapTimeout = gapTimeout
+        self.batchSize = batchSize
+
+        self.lastChangeId = 0
+        self._gaps: dict[int, float] = {}
+        self._lastPrune = 0.0
+
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="PolygonsChangePoller", daemon=True)
+
+    def start(self, lastChangeId: int):
+        self.lastChangeId = lastChangeId
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as error:
+                self._runOnServer(self._plugin.logger.error, f"Failed to poll polygon changes: {error}")
+
+    def poll(self):
+        session = self._dbEngine.getSession()
+        try:
+            repository = PolygonRepository(session)
+            self._prune(repository)
+
+            changes = repository.getChanges(self.lastChangeId, self._gaps, self.batchSize)
+            polygonIds = self._collect(changes)
+            if not polygonIds:
+                return
+
+            rows = list(repository.streamPolygonRows(polygonIds=polygonIds))
+
+            members: dict[int, list[str]] = {}
+            for row in repository.streamMemberRows(polygonIds=polygonIds):
+                members.setdefault(row.polygonId, []).append(row.playerName)
+
+        finally:
+            session.close()
+
+        deletedIds = polygonIds.difference(row.id for row in rows)
+        self._runOnServer(self._apply, rows, members, deletedIds)
+
+    def _collect(self, changes: list) -> set[int]:
+        now = time.monotonic()
+        polygonIds = set()
+
+        for change in changes:
+            self._gaps.pop(change.id, None)
+
+            if change.id > self.lastChangeId:
+                start = max(self.lastChangeId + 1, change.id - self.batchSize)
+                for missingId in range(start, change.id):
+                    self._gaps[missingId] = now
+                self.lastChangeId = change.id
+
+            polygonIds.add(change.polygonId)
+
+        for changeId, seen in list(self._gaps.items()):
+            if now - seen > self.gapTimeout:
+                del self._gaps[changeId]
+
+        return polygonIds
+
+    def _prune(self, repository: PolygonRepository):
+        now = time.monotonic()
+        if now - self._lastPrune < PRUNE_INTERVAL:
+            return
+
+        self._lastPrune = now
+        repository.pruneChanges(datetime.utcnow() - timedelta(seconds=self.retention))
+
+    def _apply(self, rows: list, members: dict[int, list[str]], deletedIds: set[int]):
+        for polygonId in deletedIds:
+            self._cache.removePolygon(polygonId)
+
+        for row in rows:
+            self._cache.syncPolygon(row, members.get(row.id))
+
+    def _runOnServer(self, task, *args):
+        self._plugin.server.scheduler.run_task(self._plugin, partial(task, *args))
@@ -0,0 +1,44 @@
+from typing import Optional
+
+from .polygonRecord import PolygonRecord
+
+
+class LookupMemo:
+    def __init__(self):
+        self.entries: dict[str, tuple] = {}
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, playerName: str, worldId: int, x: float, y: float, z: float) -> tuple[bool, Optional[PolygonRecord]]:
+        entry = self.entries.get(playerName)
+        if entry is not None:
+            generation, entryWorldId, polygon, minX, minY, minZ, maxX, maxY, maxZ = entry
+
+            if (generation == self.generation and entryWorldId == worldId and
+                minX <= x <= maxX and minZ <= z <= maxZ and
+                (y is None or minY <= y <= maxY)):
+                self.hits += 1
+                return True, polygon
+
+        self.misses += 1
+        return False, None
+
+    def remember(self, playerName: str, worldId: int, polygon: Optional[PolygonRecord], bounds: tuple):
+        self.entries[playerName] = (self.generation, worldId, polygon, *bounds)
+
+    def forget(self, playerName: str):
+        self.entries.pop(playerName, None)
+
+    def invalidate(self):
+        self.generation += 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / total if total else 0.0,
+            "players": len(self.entries)
+        }
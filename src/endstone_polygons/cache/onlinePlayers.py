@@ -0,0 +1,47 @@
+from bisect import bisect_left, insort
+
+
+class OnlinePlayerIndex:
+    def __init__(self):
+        self.entries: list[tuple[str, str]] = []
+        self.names: set[str] = set()
+
+    def add(self, playerName: str):
+        if playerName in self.names:
+            return
+
+        self.names.add(playerName)
+        insort(self.entries, (playerName.casefold(), playerName))
+
+    def remove(self, playerName: str):
+        if playerName not in self.names:
+            return
+
+        self.names.discard(playerName)
+        entry = (playerName.casefold(), playerName)
+        position = bisect_left(self.entries, entry)
+        if position < len(self.entries) and self.entries[position] == entry:
+            del self.entries[position]
+
+    def search(self, prefix: str = "") -> list[str]:
+        if not prefix:
+            return [name for _, name in self.entries]
+
+        prefix = prefix.casefold()
+        names = []
+        for position in range(bisect_left(self.entries, (prefix,)), len(self.entries)):
+            key, name = self.entries[position]
+            if not key.startswith(prefix):
+                break
+            names.append(name)
+        return names
+
+    def clear(self):
+        self.entries.clear()
+        self.names.clear()
+
+    def __contains__(self, playerName: str) -> bool:
+        return playerName in self.names
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,48 @@
+from .polygonRecord import PolygonRecord, ALL_FLAGS
+
+
+class PermissionCache:
+    def __init__(self):
+        self.decisions: dict[tuple[int, str], int] = {}
+
+        self._playersByPolygon: dict[int, set[str]] = {}
+        self._polygonsByPlayer: dict[str, set[int]] = {}
+
+    def actions(self, polygon: PolygonRecord, playerName: str) -> int:
+        key = (polygon.id, playerName)
+        mask = self.decisions.get(key)
+        if mask is not None:
+            return mask
+
+        if polygon.owner == playerName or playerName in polygon.members:
+            mask = ALL_FLAGS
+        else:
+            mask = polygon.flags
+
+        self.decisions[key] = mask
+        self._playersByPolygon.setdefault(polygon.id, set()).add(playerName)
+        self._polygonsByPlayer.setdefault(playerName, set()).add(polygon.id)
+        return mask
+
+    def invalidatePolygon(self, polygonId: int):
+        for playerName in self._playersByPolygon.pop(polygonId, ()):
+            self.decisions.pop((polygonId, playerName), None)
+
+            polygonIds = self._polygonsByPlayer.get(playerName)
+            if polygonIds is not None:
+                polygonIds.discard(polygonId)
+                if not polygonIds:
+                    del self._polygonsByPlayer[playerName]
+
+    def forgetPlayer(self, playerName: str):
+        for polygonId in self._polygonsByPlayer.pop(playerName, ()):
+            self.decisions.pop((polygonId, playerName), None)
+
+            playerNames = self._playersByPolygon.get(polygonId)
+            if playerNames is not None:
+                playerNames.discard(playerName)
+                if not playerNames:
+                    del self._playersByPolygon[polygonId]
+
+    def __len__(self) -> int:
+        return len(self.decisions)
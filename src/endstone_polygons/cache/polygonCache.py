@@ -0,0 +1,539 @@
+import sys
+
+from math import inf, hypot
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from endstone import Logger
+
+from .lookupMemo import LookupMemo
+from .onlinePlayers import OnlinePlayerIndex
+from .permissionCache import PermissionCache
+from .regionStats import computeRegionStats
+from .spatialBackend import SpatialBackend, SPATIAL_BACKENDS, createSpatialBackend
+from .polygonRecord import PolygonRecord, packFlags, FLAG_BITS, FLAG_BREAK, FLAG_PLACE, FLAG_OPEN_CHESTS
+
+from ..database.models import Polygon
+from ..database.repository import PolygonRepository
+
+
+WILDERNESS_CELL_SIZE = 16
+CHUNK_SIZE = 16
+
+
+class PolygonCache:
+    def __init__(self, logger: Logger, config: Optional[dict] = None):
+        cacheConfig: dict = (config or {}).get("cache", {})
+
+        self.logger = logger
+        self.backend: str = cacheConfig.get("backend", "rtree")
+        self.indexDimension: int = cacheConfig.get("indexDimension", 2)
+        self.chunkSize: int = cacheConfig.get("chunkSize", 16)
+
+        if self.backend not in SPATIAL_BACKENDS:
+            raise ValueError(f"Unknown spatial backend: {self.backend}")
+        if self.indexDimension not in (2, 3):
+            raise ValueError(f"Unsupported spatial index dimension: {self.indexDimension}")
+
+        self.worldIds: dict[str, int] = {}
+        self.worldNames: list[str] = []
+        self.spatialIndexes: dict[int, SpatialBackend] = {}
+
+        self.polygons: dict[int, PolygonRecord] = {}
+        self.polygonIdsByOwner: dict[str, set[int]] = {}
+        self.polygonIdsByName: dict[str, int] = {}
+        self.lookupMemo = LookupMemo()
+        self.permissions = PermissionCache()
+        self.onlinePlayers = OnlinePlayerIndex()
+
+        self.metrics = None
+        self.tiles = None
+        self.loaded = False
+
+    def getWorldId(self, world: str) -> int:
+        worldId = self.worldIds.get(world)
+        if worldId is None:
+            world = sys.intern(world)
+            worldId = len(self.worldNames)
+            self.worldIds[world] = worldId
+            self.worldNames.append(world)
+        return worldId
+
+    def getSpatialIndex(self, world: str) -> Optional[SpatialBackend]:
+        worldId = self.worldIds.get(world)
+        if worldId is None:
+            return None
+        return self.spatialIndexes.get(worldId)
+
+    def _getOrCreateSpatialIndex(self, worldId: int) -> SpatialBackend:
+        spatialIndex = self.spatialIndexes.get(worldId)
+        if spatialIndex is None:
+            tileSize = self.tiles.tileSize if self.tiles is not None else 0
+            spatialIndex = createSpatialBackend(self.backend, self.indexDimension, self.chunkSize, tileSize)
+            self.spatialIndexes[worldId] = spatialIndex
+        return spatialIndex
+
+    def _registerRecord(self, record: PolygonRecord):
+        self.polygons[record.id] = record
+        self.polygonIdsByOwner.setdefault(record.owner, set()).add(record.id)
+        self.polygonIdsByName[record.name.casefold()] = record.id
+
+    def _unregisterRecord(self, record: PolygonRecord):
+        ownerIds = self.polygonIdsByOwner.get(record.owner)
+        if ownerIds is not None:
+            ownerIds.discard(record.id)
+            if not ownerIds:
+                del self.polygonIdsByOwner[record.owner]
+
+        name = record.name.casefold()
+        if self.polygonIdsByName.get(name) == record.id:
+            del self.polygonIdsByName[name]
+
+    def _indexRecord(self, record: PolygonRecord):
+        self._registerRecord(record)
+        self._getOrCreateSpatialIndex(record.worldId).insert(record.id, record.bounds)
+
+        if self.tiles is not None:
+            self.tiles.track(record)
+
+    def loadFromDatabase(self, repository: PolygonRepository):
+        self.logger.info("Loading polygons into cache...")
+
+        members: dict[int, list[str]] = {}
+        for row in repository.streamMemberRows():
+            members.setdefault(row.polygonId, []).append(row.playerName)
+
+        items: dict[int, list[tuple[int, tuple]]] = {}
+        for row in repository.streamPolygonRows():
+            worldId = self.getWorldId(row.world)
+            record = PolygonRecord.fromRow(row, self.worldNames[worldId], worldId, members.pop(row.id, None))
+
+            self._registerRecord(record)
+            items.setdefault(worldId, []).append((record.id, record.bounds))
+
+        for worldId, worldItems in items.items():
+            self._getOrCreateSpatialIndex(worldId).load(worldItems)
+
+        self.lookupMemo.invalidate()
+
+        self.logger.info(f"Loaded {len(self.polygons)} polygons")
+        self.loaded = True
+
+    def restore(self, worldNames: list[str], rows: list[tuple], indexes: dict[int, SpatialBackend]):
+        self.clear()
+        for world in worldNames:
+            self.getWorldId(world)
+
+        self.spatialIndexes.update(indexes)
+
+        items: dict[int, list[tuple[int, tuple]]] = {}
+        for row in rows:
+            record = PolygonRecord.fromTuple(row, self.worldNames)
+            self._registerRecord(record)
+
+            if record.worldId not in indexes:
+                items.setdefault(record.worldId, []).append((record.id, record.bounds))
+
+        for worldId, worldItems in items.items():
+            self._getOrCreateSpatialIndex(worldId).load(worldItems)
+
+        self.logger.info(f"Loaded {len(self.polygons)} polygons from snapshot")
+        self.loaded = True
+
+    def exportRecords(self) -> list[tuple]:
+        return [polygon.toTuple() for polygon in self.polygons.values()]
+
+    def clear(self):
+        self.close()
+
+        self.worldIds.clear()
+        self.worldNames.clear()
+        self.spatialIndexes.clear()
+        self.polygons.clear()
+        self.polygonIdsByOwner.clear()
+        self.polygonIdsByName.clear()
+
+        self.lookupMemo = LookupMemo()
+        self.permissions = PermissionCache()
+        self.loaded = False
+
+    def close(self):
+        for spatialIndex in self.spatialIndexes.values():
+            spatialIndex.close()
+
+    def findPolygonAtPosition(self, world: str, x: float, z: float, y: float) -> Optional[PolygonRecord]:
+        if self.tiles is not None and not self.tiles.ensurePoint(self.getWorldId(world), x, z):
+            return self.tiles.pending
+
+        return self._findPolygonAtPosition(world, x, z, y)
+
+    def _findPolygonAtPosition(self, world: str, x: float, z: float, y: float) -> Optional[PolygonRecord]:
+        spatialIndex = self.getSpatialIndex(world)
+        if spatialIndex is None:
+            return None
+
+        exact = spatialIndex.exact
+        metrics = self.metrics
+
+        candidates = 0
+        for candidates, polygonId in enumerate(spatialIndex.queryPoint(x, y, z), 1):
+            polygon = self.polygons.get(polygonId)
+
+            if polygon and (exact or polygon.contains(x, y, z)):
+                if metrics:
+                    metrics.recordCandidates("point", candidates)
+                return polygon
+
+        if metrics:
+            metrics.recordCandidates("point", candidates)
+        return None
+
+    def findPolygonsAtPositions(self, world: str, positions: list[tuple]) -> list[Optional[PolygonRecord]]:
+        results: list[Optional[PolygonRecord]] = [None] * len(positions)
+
+        if self.tiles is not None and positions:
+            xs = [position[0] for position in positions]
+            zs = [position[2] for position in positions]
+            if not self.tiles.ensureArea(self.getWorldId(world), min(xs), min(zs), max(xs), max(zs)):
+                return [self.tiles.pending] * len(positions)
+
+        spatialIndex = self.getSpatialIndex(world)
+        if spatialIndex is None or not positions:
+            return results
+
+        chunks: dict[tuple[int, int], list[int]] = {}
+        for index, (x, _, z) in enumerate(positions):
+            chunks.setdefault((int(x // CHUNK_SIZE), int(z // CHUNK_SIZE)), []).append(index)
+
+        points = np.array(positions, dtype=np.float64)
+        polygons = self.polygons
+
+        for indexes in chunks.values():
+            chunkPoints = points[indexes]
+            low = chunkPoints.min(axis=0)
+            high = chunkPoints.max(axis=0)
+
+            candidates = [
+                polygons[polygonId]
+                for polygonId in spatialIndex.queryBox(low[0], low[1], low[2], high[0], high[1], high[2])
+                if polygonId in polygons
+            ]
+            if not candidates:
+                continue
+
+            bounds = np.array([polygon.bounds for polygon in candidates], dtype=np.float64)
+            inside = ((chunkPoints[:, None, :] >= bounds[None, :, :3]) &
+                      (chunkPoints[:, None, :] <= bounds[None, :, 3:])).all(axis=2)
+
+            first = inside.argmax(axis=1)
+            for row in np.flatnonzero(inside.any(axis=1)):
+                results[indexes[row]] = candidates[first[row]]
+
+        return results
+
+    def findNearestPolygons(self, world: str, x: float, z: float, count: int = 5) -> list[tuple[PolygonRecord, float]]:
+        if self.tiles is not None:
+            reach = self.tiles.tileSize
+            self.tiles.ensureArea(self.getWorldId(world), x - reach, z - reach, x + reach, z + reach, wait=True)
+
+        spatialIndex = self.getSpatialIndex(world)
+        if spatialIndex is None or count <= 0:
+            return []
+
+        nearest = []
+        polygons = self.polygons
+        for polygonId in spatialIndex.nearest(x, z, count):
+            polygon = polygons.get(polygonId)
+            if polygon is None:
+                continue
+
+            distanceX = max(polygon.minX - x, 0, x - polygon.maxX)
+            distanceZ = max(polygon.minZ - z, 0, z - polygon.maxZ)
+            nearest.append((hypot(distanceX, distanceZ), polygon.id, polygon))
+
+        nearest.sort()
+        return [(polygon, distance) for distance, _, polygon in nearest[:count]]
+
+    def findPolygonForPlayer(self, playerName: str, world: str, x: float, z: float, y: float) -> Optional[PolygonRecord]:
+        if self.tiles is not None and not self.tiles.ensurePoint(self.getWorldId(world), x, z):
+            return self.tiles.pending
+
+        worldId = self.worldIds.get(world)
+        if worldId is None:
+            return None
+
+        found, polygon = self.lookupMemo.get(playerName, worldId, x, y, z)
+        if found:
+            return polygon
+
+        polygon = self._findPolygonAtPosition(world, x, z, y)
+        if polygon:
+            self.lookupMemo.remember(playerName, worldId, polygon, polygon.bounds)
+            return polygon
+
+        cell = self._wildernessCell(worldId, x, z)
+        if cell:
+            self.lookupMemo.remember(playerName, worldId, None, cell)
+
+        return None
+
+    def _wildernessCell(self, worldId: int, x: float, z: float) -> Optional[tuple]:
+        minX = int(x // WILDERNESS_CELL_SIZE) * WILDERNESS_CELL_SIZE
+        minZ = int(z // WILDERNESS_CELL_SIZE) * WILDERNESS_CELL_SIZE
+        maxX = minX + WILDERNESS_CELL_SIZE - 1
+        maxZ = minZ + WILDERNESS_CELL_SIZE - 1
+
+        spatialIndex = self.spatialIndexes.get(worldId)
+        if spatialIndex is not None and not spatialIndex.isEmpty(minX, -inf, minZ, maxX, inf, maxZ):
+            return None
+
+        return (minX, -inf, minZ, maxX, inf, maxZ)
+
+    def forgetPlayer(self, playerName: str):
+        self.lookupMemo.forget(playerName)
+        self.permissions.forgetPlayer(playerName)
+
+    def addPolygon(self, polygon: Polygon) -> PolygonRecord:
+        worldId = self.getWorldId(polygon.world)
+        record = PolygonRecord.fromModel(polygon, self.worldNames[worldId], worldId)
+
+        if self.tiles is not None:
+            self.tiles.revive(record.id)
+        self._indexRecord(record)
+        self.lookupMemo.invalidate()
+        return record
+
+    def syncPolygon(self, row, members: Optional[list[str]] = None) -> PolygonRecord:
+        worldId = self.getWorldId(row.world)
+        record = PolygonRecord.fromRow(row, self.worldNames[worldId], worldId, members)
+
+        existing = self.polygons.get(record.id)
+        if (existing and existing.toTuple()[:-1] == record.toTuple()[:-1] and
+            existing.members == record.members):
+            return existing
+
+        self._dropRecord(record.id)
+        if self.tiles is None:
+            self._indexRecord(record)
+            return record
+
+        self.tiles.revive(record.id)
+        if self.tiles.holds(record):
+            self._indexRecord(record)
+        return record
+
+    def syncPolygons(self, rows, members: Optional[dict[int, list[str]]] = None) -> list[PolygonRecord]:
+        members = members or {}
+        return [self.syncPolygon(row, members.get(row.id)) for row in rows]
+
+    def removePolygon(self, polygonId: int):
+        self._dropRecord(polygonId)
+        if self.tiles is not None:
+            self.tiles.forget(polygonId)
+
+    def _dropRecord(self, polygonId: int):
+        polygon = self.polygons.pop(polygonId, None)
+        if not polygon:
+            return
+
+        self._unregisterRecord(polygon)
+        if self.tiles is not None:
+            self.tiles.untrack(polygon)
+
+        spatialIndex = self.spatialIndexes.get(polygon.worldId)
+        if spatialIndex is not None:
+            spatialIndex.delete(polygon.id, polygon.bounds)
+
+        self.lookupMemo.invalidate()
+        self.permissions.invalidatePolygon(polygonId)
+
+    def updatePolygonCoordinates(self, polygonId: int,
+                                 minX: float = None, minY: float = None, minZ: float = None,
+                                 maxX: float = None, maxY: float = None, maxZ: float = None):
+        polygon = self.polygons.get(polygonId)
+        if not polygon:
+            return
+
+        spatialIndex = self.spatialIndexes.get(polygon.worldId)
+        if spatialIndex is not None:
+            spatialIndex.delete(polygon.id, polygon.bounds)
+
+        if minX is not None:
+            polygon.minX = minX
+        if minY is not None:
+            polygon.minY = minY
+        if minZ is not None:
+            polygon.minZ = minZ
+        if maxX is not None:
+            polygon.maxX = maxX
+        if maxY is not None:
+            polygon.maxY = maxY
+        if maxZ is not None:
+            polygon.maxZ = maxZ
+
+        self._indexRecord(polygon)
+        self.lookupMemo.invalidate()
+
+    def updatePolygonFlags(self, polygonId: int, **kwargs):
+        polygon = self.polygons.get(polygonId)
+        if not polygon:
+            return
+
+        mask = 0
+        for key in kwargs:
+            mask |= FLAG_BITS.get(key, 0)
+
+        polygon.flags = (polygon.flags & ~mask) | packFlags(**kwargs)
+        self.permissions.invalidatePolygon(polygonId)
+
+    def updatePolygonsFlags(self, polygonIds: Iterable[int], **kwargs):
+        mask = 0
+        for key in kwargs:
+            mask |= FLAG_BITS.get(key, 0)
+        flags = packFlags(**kwargs)
+
+        for polygonId in polygonIds:
+            polygon = self.polygons.get(polygonId)
+            if polygon:
+                polygon.flags = (polygon.flags & ~mask) | flags
+                self.permissions.invalidatePolygon(polygonId)
+
+    def addMember(self, polygonId: int, playerName: str):
+        polygon = self.polygons.get(polygonId)
+        if polygon:
+            polygon.members = polygon.members | {playerName}
+            self.permissions.invalidatePolygon(polygonId)
+
+    def removeMember(self, polygonId: int, playerName: str):
+        polygon = self.polygons.get(polygonId)
+        if polygon and playerName in polygon.members:
+            polygon.members = polygon.members - {playerName}
+            self.permissions.invalidatePolygon(polygonId)
+
+    def addMembers(self, polygonIds: Iterable[int], playerNames: Iterable[str]):
+        playerNames = frozenset(playerNames)
+        for polygonId in polygonIds:
+            polygon = self.polygons.get(polygonId)
+            if polygon and not playerNames <= polygon.members:
+                polygon.members = polygon.members | playerNames
+                self.permissions.invalidatePolygon(polygonId)
+
+    def removeMembers(self, polygonIds: Iterable[int], playerNames: Iterable[str]):
+        playerNames = frozenset(playerNames)
+        for polygonId in polygonIds:
+            polygon = self.polygons.get(polygonId)
+            if polygon and not playerNames.isdisjoint(polygon.members):
+                polygon.members = polygon.members - playerNames
+                self.permissions.invalidatePolygon(polygonId)
+
+    def isMember(self, polygonId: int, playerName: str) -> bool:
+        polygon = self.polygons.get(polygonId)
+        return bool(polygon) and playerName in polygon.members
+
+    def isOwner(self, polygonId: int, playerName: str) -> bool:
+        polygon = self.polygons.get(polygonId)
+        return polygon and polygon.owner == playerName
+
+    def getPolygonIdsByOwner(self, owner: str) -> list[int]:
+        return sorted(self.polygonIdsByOwner.get(owner, ()))
+
+    def getPolygonsByOwner(self, owner: str) -> list[PolygonRecord]:
+        polygons = self.polygons
+        return [polygons[polygonId] for polygonId in self.getPolygonIdsByOwner(owner)]
+
+    def getPolygonByName(self, name: str) -> Optional[PolygonRecord]:
+        polygonId = self.polygonIdsByName.get(name.casefold())
+        return self.polygons.get(polygonId) if polygonId is not None else None
+
+    def isNameTaken(self, name: str) -> bool:
+        return name.casefold() in self.polygonIdsByName
+
+    def canBreak(self, polygon: PolygonRecord, playerName: str) -> bool:
+        return bool(self.permissions.actions(polygon, playerName) & FLAG_BREAK)
+
+    def canPlace(self, polygon: PolygonRecord, playerName: str) -> bool:
+        return bool(self.permissions.actions(polygon, playerName) & FLAG_PLACE)
+
+    def canOpenChests(self, polygon: PolygonRecord, playerName: str) -> bool:
+        return bool(self.permissions.actions(polygon, playerName) & FLAG_OPEN_CHESTS)
+
+    def calculatePolygonBounds(self, x: float, y: float, z: float, size: int) -> tuple:
+        radius = (size - 1) / 2
+
+        blockX = int(x)
+        blockY = int(y)
+        blockZ = int(z)
+
+        minX = int(blockX - radius)
+        minY = int(blockY - radius)
+        minZ = int(blockZ - radius)
+        maxX = int(blockX + radius)
+        maxY = int(blockY + radius)
+        maxZ = int(blockZ + radius)
+
+        return (blockX, blockY, blockZ, minX, minY, minZ, maxX, maxY, maxZ)
+
+    def checkIntersection(self, world: str, minX: int, minY: int, minZ: int,
+                         maxX: int, maxY: int, maxZ: int) -> Optional[PolygonRecord]:
+        if self.tiles is not None and not self.tiles.ensureArea(self.getWorldId(world), minX, minZ, maxX, maxZ):
+            return self.tiles.pending
+
+        spatialIndex = self.getSpatialIndex(world)
+        if spatialIndex is None:
+            return None
+
+        exact = spatialIndex.exact
+        metrics = self.metrics
+
+        candidates = 0
+        for candidates, polygonId in enumerate(spatialIndex.queryBox(minX, minY, minZ, maxX, maxY, maxZ), 1):
+            polygon = self.polygons.get(polygonId)
+
+            if polygon and (exact or polygon.intersects(minX, minY, minZ, maxX, maxY, maxZ)):
+                if metrics:
+                    metrics.recordCandidates("box", candidates)
+                return polygon
+
+        if metrics:
+            metrics.recordCandidates("box", candidates)
+        return None
+
+    def findPolygonsInRegion(self, world: str, minX: float, minY: float, minZ: float,
+                             maxX: float, maxY: float, maxZ: float,
+                             lazy: bool = False) -> Union[list[PolygonRecord], Iterator[PolygonRecord]]:
+        polygons = self._iterPolygonsInRegion(world, minX, minY, minZ, maxX, maxY, maxZ)
+        return polygons if lazy else list(polygons)
+
+    def _iterPolygonsInRegion(self, world: str, minX: float, minY: float, minZ: float,
+                              maxX: float, maxY: float, maxZ: float) -> Iterator[PolygonRecord]:
+        if self.tiles is not None:
+            self.tiles.ensureArea(self.getWorldId(world), minX, minZ, maxX, maxZ, wait=True)
+
+        spatialIndex = self.getSpatialIndex(world)
+        if spatialIndex is None:
+            return
+
+        exact = spatialIndex.exact
+        for polygonId in spatialIndex.queryBox(minX, minY, minZ, maxX, maxY, maxZ):
+            polygon = self.polygons.get(polygonId)
+
+            if polygon and (exact or polygon.intersects(minX, minY, minZ, maxX, maxY, maxZ)):
+                yield polygon
+
+    def getRegionStats(self, world: str, minX: float, minY: float, minZ: float,
+                       maxX: float, maxY: float, maxZ: float) -> dict:
+        if self.tiles is not None:
+            self.tiles.ensureArea(self.getWorldId(world), minX, minZ, maxX, maxZ, wait=True)
+
+        spatialIndex = self.getSpatialIndex(world)
+        if spatialIndex is None:
+            return computeRegionStats([], minX, minY, minZ, maxX, maxY, maxZ)
+
+        polygons = self.polygons
+        candidates = [
+            polygons[polygonId]
+            for polygonId in spatialIndex.queryBox(minX, minY, minZ, maxX, maxY, maxZ)
+            if polygonId in polygons
+        ]
+        return computeRegionStats(candidates, minX, minY, minZ, maxX, maxY, maxZ)
@@ -0,0 +1,148 @@
+from typing import Iterable, Optional
+
+from ..database.models import Polygon
+
+
+FLAG_BREAK = 1
+FLAG_PLACE = 2
+FLAG_OPEN_CHESTS = 4
+FLAG_EXPLOSIONS = 8
+
+ALL_FLAGS = FLAG_BREAK | FLAG_PLACE | FLAG_OPEN_CHESTS
+
+FLAG_BITS = {
+    "canBreak": FLAG_BREAK,
+    "canPlace": FLAG_PLACE,
+    "canOpenChests": FLAG_OPEN_CHESTS,
+    "allowExplosions": FLAG_EXPLOSIONS
+}
+
+
+def packFlags(**flags) -> int:
+    bits = 0
+    for key, value in flags.items():
+        bit = FLAG_BITS.get(key)
+        if bit and value:
+            bits |= bit
+    return bits
+
+
+class PolygonRecord:
+    __slots__ = (
+        "id", "name", "owner", "world", "worldId",
+        "minX", "minY", "minZ", "maxX", "maxY", "maxZ",
+        "centerX", "centerY", "centerZ",
+        "flags", "members"
+    )
+
+    def __init__(
+            self,
+            id: int,
+            name: str,
+            owner: str,
+            world: str,
+            worldId: int,
+            bounds: tuple,
+            center: tuple,
+            flags: int = 0,
+            members: Optional[Iterable[str]] = None
+        ):
+        self.id = id
+        self.name = name
+        self.owner = owner
+        self.world = world
+        self.worldId = worldId
+
+        self.minX, self.minY, self.minZ, self.maxX, self.maxY, self.maxZ = bounds
+        self.centerX, self.centerY, self.centerZ = center
+
+        self.flags = flags
+        self.members = frozenset(members) if members else frozenset()
+
+    @classmethod
+    def fromRow(cls, row, world: str, worldId: int, members: Optional[Iterable[str]] = None) -> "PolygonRecord":
+        return cls(
+            row.id, row.name, row.owner, world, worldId,
+            (row.minX, row.minY, row.minZ, row.maxX, row.maxY, row.maxZ),
+            (row.centerX, row.centerY, row.centerZ),
+            packFlags(
+                canBreak=row.canBreak,
+                canPlace=row.canPlace,
+                canOpenChests=row.canOpenChests,
+                allowExplosions=row.allowExplosions
+            ),
+            members
+        )
+
+    @classmethod
+    def fromModel(cls, polygon: Polygon, world: str, worldId: int) -> "PolygonRecord":
+        coords = polygon.coordinates
+        flags = polygon.flags
+
+        return cls(
+            polygon.id, polygon.name, polygon.owner, world, worldId,
+            (coords.minX, coords.minY, coords.minZ, coords.maxX, coords.maxY, coords.maxZ),
+            (coords.centerX, coords.centerY, coords.centerZ),
+            packFlags(
+                canBreak=flags.canBreak,
+                canPlace=flags.canPlace,
+                canOpenChests=flags.canOpenChests,
+                allowExplosions=flags.allowExplosions
+            ) if flags else 0,
+            [member.playerName for member in polygon.members]
+        )
+
+    @classmethod
+    def fromTuple(cls, values: tuple, worldNames: list[str]) -> "PolygonRecord":
+        (id, name, owner, worldId,
+         minX, minY, minZ, maxX, maxY, maxZ,
+         centerX, centerY, centerZ, flags, members) = values
+
+        return cls(
+            id, name, owner, worldNames[worldId], worldId,
+            (minX, minY, minZ, maxX, maxY, maxZ),
+            (centerX, centerY, centerZ),
+            flags,
+            members
+        )
+
+    def toTuple(self) -> tuple:
+        return (
+            self.id, self.name, self.owner, self.worldId,
+            self.minX, self.minY, self.minZ, self.maxX, self.maxY, self.maxZ,
+            self.centerX, self.centerY, self.centerZ,
+            self.flags, tuple(self.members)
+        )
+
+    @property
+    def bounds(self) -> tuple:
+        return (self.minX, self.minY, self.minZ, self.maxX, self.maxY, self.maxZ)
+
+    @property
+    def canBreak(self) -> bool:
+        return bool(self.flags & FLAG_BREAK)
+
+    @property
+    def canPlace(self) -> bool:
+        return bool(self.flags & FLAG_PLACE)
+
+    @property
+    def canOpenChests(self) -> bool:
+        return bool(self.flags & FLAG_OPEN_CHESTS)
+
+    @property
+    def allowExplosions(self) -> bool:
+        return bool(self.flags & FLAG_EXPLOSIONS)
+
+    def contains(self, x: float, y: float, z: float) -> bool:
+        return (self.minX <= x <= self.maxX and
+                self.minZ <= z <= self.maxZ and
+                (y is None or self.minY <= y <= self.maxY))
+
+    def intersects(self, minX: int, minY: int, minZ: int, maxX: int, maxY: int, maxZ: int) -> bool:
+        return not (maxX < self.minX or minX > self.maxX or
+                    maxY < self.minY or minY > self.maxY or
+                    maxZ < self.minZ or minZ > self.maxZ)
+
+    def __repr__(self) -> str:
+        return f"<PolygonRecord(id={self.id}, name='{self.name}', owner='{self.owner}')>"
@@ -0,0 +1,26 @@
+import numpy as np
+
+from .polygonRecord import PolygonRecord
+
+
+def computeRegionStats(polygons: list[PolygonRecord], minX: float, minY: float, minZ: float,
+                       maxX: float, maxY: float, maxZ: float) -> dict:
+    if not polygons:
+        return {"count": 0, "coveredVolume": 0, "totalVolume": 0, "owners": []}
+
+    bounds = np.array([polygon.bounds for polygon in polygons], dtype=np.float64)
+    owners = np.array([polygon.owner for polygon in polygons], dtype=object)
+
+    low = np.maximum(bounds[:, :3], (minX, minY, minZ))
+    high = np.minimum(bounds[:, 3:], (maxX, maxY, maxZ))
+    overlap = high - low + 1
+
+    mask = (overlap > 0).all(axis=1)
+    sizes = bounds[mask, 3:] - bounds[mask, :3] + 1
+
+    return {
+        "count": int(mask.sum()),
+        "coveredVolume": int(overlap[mask].prod(axis=1).sum()),
+        "totalVolume": int(sizes.prod(axis=1).sum()),
+        "owners": np.unique(owners[mask]).tolist()
+    }
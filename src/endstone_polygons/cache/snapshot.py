@@ -0,0 +1,159 @@
+import json
+import os
+import pickle
+import shutil
+import threading
+
+from pathlib import Path
+from typing import Optional
+
+from endstone import Logger
+
+from .polygonCache import PolygonCache
+from .spatialBackend import RTreeBackend
+
+from ..database.engine import DatabaseEngine
+from ..database.repository import PolygonRepository
+
+
+SNAPSHOT_VERSION = 1
+
+
+class CacheSnapshot:
+    def __init__(self, folder: Path, logger: Logger):
+        self.folder = Path(folder)
+        self.logger = logger
+        self.manifestPath = self.folder / "manifest.json"
+
+        self._writer: Optional[threading.Thread] = None
+
+    def _readManifest(self) -> Optional[dict]:
+        try:
+            return json.loads(self.manifestPath.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def load(self, cache: PolygonCache, repository: PolygonRepository) -> bool:
+        manifest = self._readManifest()
+        if manifest is None:
+            return False
+
+        if (manifest.get("version") != SNAPSHOT_VERSION or
+            manifest.get("backend") != cache.backend or
+            manifest.get("indexDimension") != cache.indexDimension):
+            self.logger.info("Cache snapshot was written with other settings, loading from database")
+            return False
+
+        if tuple(manifest.get("stamp") or ()) != repository.getVersionStamp():
+            self.logger.info("Cache snapshot is outdated, loading from database")
+            return False
+
+        generation = manifest["generation"]
+
+        try:
+            with open(self.folder / f"records-{generation}.bin", "rb") as file:
+                worldNames, rows = pickle.load(file)
+
+            indexes = {}
+            if cache.backend == "rtree":
+                for worldId in range(len(worldNames)):
+                    source = self.folder / f"rtree-{generation}-{worldId}"
+                    if not Path(f"{source}.dat").exists():
+                        continue
+
+                    live = self.folder / f"live-{worldId}"
+                    for suffix in (".dat", ".idx"):
+                        shutil.copyfile(f"{source}{suffix}", f"{live}{suffix}")
+
+                    indexes[worldId] = RTreeBackend(cache.indexDimension, str(live))
+
+            cache.restore(worldNames, rows, indexes)
+            return True
+
+        except Exception as error:
+            self.logger.warning(f"Failed to read cache snapshot, loading from database: {error}")
+            cache.clear()
+            return False
+
+    def write(self, cache: PolygonCache, dbEngine: DatabaseEngine, background: bool = False):
+        if self._writer and self._writer.is_alive():
+            if background:
+                return
+            self._writer.join()
+
+        session = dbEngine.getSession()
+        try:
+            stamp = PolygonRepository(session).getVersionStamp()
+        except Exception as error:
+            self.logger.error(f"Failed to write cache snapshot: {error}")
+            return
+        finally:
+            session.close()
+
+        worldNames = list(cache.worldNames)
+        rows = cache.exportRecords()
+
+        args = (stamp, worldNames, rows, cache.backend, cache.indexDimension)
+        if not background:
+            self._write(*args)
+            return
+
+        self._writer = threading.Thread(target=self._write, args=args, name="PolygonsSnapshot", daemon=True)
+        self._writer.start()
+
+    def _write(self, stamp: tuple, worldNames: list[str], rows: list[tuple],
+               backend: str, indexDimension: int):
+        try:
+            manifest = self._readManifest() or {}
+            generation = manifest.get("generation", 0) + 1
+
+            self.folder.mkdir(parents=True, exist_ok=True)
+            with open(self.folder / f"records-{generation}.bin", "wb") as file:
+                pickle.dump((worldNames, rows), file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            if backend == "rtree":
+                self._writeIndexes(generation, rows, indexDimension)
+
+            temporary = self.folder / "manifest.json.tmp"
+            temporary.write_text(json.dumps({
+                "version": SNAPSHOT_VERSION,
+                "generation": generation,
+                "stamp": stamp,
+                "backend": backend,
+                "indexDimension": indexDimension,
+                "polygons": len(rows)
+            }))
+            os.replace(temporary, self.manifestPath)
+
+            self._removeGenerations(generation)
+            self.logger.info(f"Cache snapshot saved ({len(rows)} polygons)")
+
+        except Exception as error:
+            self.logger.error(f"Failed to write cache snapshot: {error}")
+
+    def _writeIndexes(self, generation: int, rows: list[tuple], indexDimension: int):
+        indexes: dict[int, RTreeBackend] = {}
+        try:
+            for row in rows:
+                worldId = row[3]
+                spatialIndex = indexes.get(worldId)
+                if spatialIndex is None:
+                    path = str(self.folder / f"rtree-{generation}-{worldId}")
+                    spatialIndex = indexes[worldId] = RTreeBackend(indexDimension, path, overwrite=True)
+
+                spatialIndex.insert(row[0], row[4:10])
+        finally:
+            for spatialIndex in indexes.values():
+                spatialIndex.close()
+
+    def _removeGenerations(self, current: int):
+        for path in self.folder.iterdir():
+            if not path.name.startswith(("records-", "rtree-")):
+                continue
+
+            generation = path.name.split("-")[1].split(".")[0]
+            if generation.isdigit() and int(generation) != current:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
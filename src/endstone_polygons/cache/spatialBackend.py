@@ -0,0 +1,473 @@
+from abc import ABC, abstractmethod
+from heapq import heappush, heapreplace
+from math import inf
+from typing import Callable, Iterable, Optional
+
+from rtree import index
+
+
+NEAREST_HEIGHT = 1e7
+NEAREST_BLOCK_CELLS = 8
+
+
+def _gap(index: int, point: float, size: int) -> float:
+    return max(index * size - point, 0, point - (index + 1) * size)
+
+
+def _keepNearest(best: list[tuple[float, int]], count: int, polygonId: int, box: tuple, x: float, z: float):
+    minX, minZ, maxX, maxZ = box
+    distanceX = max(minX - x, 0, x - maxX)
+    distanceZ = max(minZ - z, 0, z - maxZ)
+    distance = distanceX * distanceX + distanceZ * distanceZ
+
+    if len(best) < count:
+        heappush(best, (-distance, polygonId))
+    elif distance < -best[0][0]:
+        heapreplace(best, (-distance, polygonId))
+
+
+def _ring(centerX: int, centerZ: int, radius: int, extent: tuple[int, int, int, int]):
+    minX, minZ, maxX, maxZ = extent
+
+    fromX, toX = max(centerX - radius, minX), min(centerX + radius, maxX)
+    for rowZ in {centerZ - radius, centerZ + radius}:
+        if minZ <= rowZ <= maxZ and fromX <= toX:
+            yield True, rowZ, fromX, toX
+
+    fromZ, toZ = max(centerZ - radius + 1, minZ), min(centerZ + radius - 1, maxZ)
+    for columnX in {centerX - radius, centerX + radius} if radius else ():
+        if minX <= columnX <= maxX and fromZ <= toZ:
+            yield False, columnX, fromZ, toZ
+
+
+def _reach(x: float, z: float, centerX: int, centerZ: int, radius: int, size: int,
+           extent: tuple[int, int, int, int]) -> Optional[float]:
+    minX, minZ, maxX, maxZ = extent
+
+    reach = []
+    if centerX - radius > minX:
+        reach.append(x - (centerX - radius) * size)
+    if centerX + radius < maxX:
+        reach.append((centerX + radius + 1) * size - x)
+    if centerZ - radius > minZ:
+        reach.append(z - (centerZ - radius) * size)
+    if centerZ + radius < maxZ:
+        reach.append((centerZ + radius + 1) * size - z)
+
+    return min(reach) if reach else None
+
+
+class SpatialBackend(ABC):
+    exact = False
+
+    @abstractmethod
+    def insert(self, polygonId: int, bounds: tuple): pass
+
+    @abstractmethod
+    def delete(self, polygonId: int, bounds: tuple): pass
+
+    @abstractmethod
+    def queryPoint(self, x: float, y: float, z: float) -> Iterable[int]: pass
+
+    @abstractmethod
+    def queryBox(self, minX: float, minY: float, minZ: float,
+                 maxX: float, maxY: float, maxZ: float) -> Iterable[int]: pass
+
+    @abstractmethod
+    def nearest(self, x: float, z: float, count: int) -> Iterable[int]: pass
+
+    def isEmpty(self, minX: float, minY: float, minZ: float,
+                maxX: float, maxY: float, maxZ: float) -> bool:
+        for _ in self.queryBox(minX, minY, minZ, maxX, maxY, maxZ):
+            return False
+        return True
+
+    def load(self, items: list[tuple[int, tuple]]):
+        for polygonId, bounds in items:
+            self.insert(polygonId, bounds)
+
+    def close(self):
+        pass
+
+    def __len__(self) -> int:
+        return 0
+
+
+class RTreeBackend(SpatialBackend):
+    def __init__(self, dimension: int = 2, path: Optional[str] = None, overwrite: bool = False):
+        if dimension not in (2, 3):
+            raise ValueError(f"Unsupported spatial index dimension: {dimension}")
+
+        self.dimension = dimension
+        self.exact = dimension == 3
+
+        properties = index.Property(dimension=dimension)
+        if path is None:
+            self.index = index.Index(properties=properties)
+            self.size = 0
+        else:
+            properties.overwrite = overwrite
+            self.index = index.Index(path, properties=properties)
+            self.size = len(self.index)
+
+    def _bounds(self, minX: float, minY: float, minZ: float,
+                maxX: float, maxY: float, maxZ: float) -> tuple:
+        if self.dimension == 3:
+            return (minX, minY, minZ, maxX, maxY, maxZ)
+        return (minX, minZ, maxX, maxZ)
+
+    def insert(self, polygonId: int, bounds: tuple):
+        self.index.insert(polygonId, self._bounds(*bounds))
+        self.size += 1
+
+    def delete(self, polygonId: int, bounds: tuple):
+        self.index.delete(polygonId, self._bounds(*bounds))
+        self.size -= 1
+
+    def queryPoint(self, x: float, y: float, z: float) -> Iterable[int]:
+        if y is None:
+            return self.index.intersection(self._bounds(x, -inf, z, x, inf, z))
+        return self.index.intersection(self._bounds(x, y, z, x, y, z))
+
+    def queryBox(self, minX: float, minY: float, minZ: float,
+                 maxX: float, maxY: float, maxZ: float) -> Iterable[int]:
+        return self.index.intersection(self._bounds(minX, minY, minZ, maxX, maxY, maxZ))
+
+    def isEmpty(self, minX: float, minY: float, minZ: float,
+                maxX: float, maxY: float, maxZ: float) -> bool:
+        return self.index.count(self._bounds(minX, minY, minZ, maxX, maxY, maxZ)) == 0
+
+    def nearest(self, x: float, z: float, count: int) -> Iterable[int]:
+        return self.index.nearest(self._bounds(x, -NEAREST_HEIGHT, z, x, NEAREST_HEIGHT, z), count)
+
+    def close(self):
+        self.index.close()
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class ChunkGridBackend(SpatialBackend):
+    def __init__(self, chunkSize: int = 16):
+        self.chunkSize = chunkSize
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        self.extent: Optional[tuple[int, int, int, int]] = None
+        self.blocks: dict[tuple[int, int], set[tuple[int, int]]] = {}
+        self.boxes: dict[int, tuple] = {}
+        self.size = 0
+
+    def _cellRange(self, minX: float, minZ: float, maxX: float, maxZ: float, existingOnly: bool = True):
+        size = self.chunkSize
+        minCellX, maxCellX = int(minX // size), int(maxX // size)
+        minCellZ, maxCellZ = int(minZ // size), int(maxZ // size)
+
+        if existingOnly and (maxCellX - minCellX + 1) * (maxCellZ - minCellZ + 1) > len(self.cells):
+            for cellX, cellZ in list(self.cells):
+                if minCellX <= cellX <= maxCellX and minCellZ <= cellZ <= maxCellZ:
+                    yield cellX, cellZ
+            return
+
+        for cellX in range(minCellX, maxCellX + 1):
+            for cellZ in range(minCellZ, maxCellZ + 1):
+                yield cellX, cellZ
+
+    def insert(self, polygonId: int, bounds: tuple):
+        minX, _, minZ, maxX, _, maxZ = bounds
+        for cell in self._cellRange(minX, minZ, maxX, maxZ, existingOnly=False):
+            polygonIds = self.cells.get(cell)
+            if polygonIds is None:
+                polygonIds = self.cells[cell] = []
+                self.blocks.setdefault(self._block(cell), set()).add(cell)
+            polygonIds.append(polygonId)
+        self.boxes[polygonId] = (minX, minZ, maxX, maxZ)
+        self.size += 1
+
+        size = self.chunkSize
+        minCellX, minCellZ = int(minX // size), int(minZ // size)
+        maxCellX, maxCellZ = int(maxX // size), int(maxZ // size)
+        if self.extent is not None:
+            extentMinX, extentMinZ, extentMaxX, extentMaxZ = self.extent
+            minCellX, minCellZ = min(minCellX, extentMinX), min(minCellZ, extentMinZ)
+            maxCellX, maxCellZ = max(maxCellX, extentMaxX), max(maxCellZ, extentMaxZ)
+        self.extent = (minCellX, minCellZ, maxCellX, maxCellZ)
+
+    def delete(self, polygonId: int, bounds: tuple):
+        minX, _, minZ, maxX, _, maxZ = bounds
+        for cell in self._cellRange(minX, minZ, maxX, maxZ):
+            polygonIds = self.cells.get(cell)
+            if polygonIds is None:
+                continue
+
+            if polygonId in polygonIds:
+                polygonIds.remove(polygonId)
+            if not polygonIds:
+                del self.cells[cell]
+
+                block = self._block(cell)
+                self.blocks[block].discard(cell)
+                if not self.blocks[block]:
+                    del self.blocks[block]
+        self.boxes.pop(polygonId, None)
+        self.size -= 1
+
+    def queryPoint(self, x: float, y: float, z: float) -> Iterable[int]:
+        return self.cells.get((int(x // self.chunkSize), int(z // self.chunkSize)), ())
+
+    def _block(self, cell: tuple[int, int]) -> tuple[int, int]:
+        return cell[0] // NEAREST_BLOCK_CELLS, cell[1] // NEAREST_BLOCK_CELLS
+
+    def nearest(self, x: float, z: float, count: int) -> Iterable[int]:
+        if self.extent is None or count <= 0:
+            return ()
+        if len(self.boxes) <= count:
+            return list(self.boxes)
+
+        size = self.chunkSize * NEAREST_BLOCK_CELLS
+        centerX, centerZ = int(x // size), int(z // size)
+        minBlockX, minBlockZ, maxBlockX, maxBlockZ = (cell // NEAREST_BLOCK_CELLS for cell in self.extent)
+        extent = (minBlockX, minBlockZ, maxBlockX, maxBlockZ)
+
+        best: list[tuple[float, int]] = []
+        seen: set[int] = set()
+        visited = 0
+
+        radius = max(0, minBlockX - centerX, centerX - maxBlockX, minBlockZ - centerZ, centerZ - maxBlockZ)
+        while True:
+            for alongX, fixed, low, high in _ring(centerX, centerZ, radius, extent):
+                if alongX:
+                    point, fixedGap = x, _gap(fixed, z, size)
+                else:
+                    point, fixedGap = z, _gap(fixed, x, size)
+
+                start = min(max(int(point // size), low), high)
+                for blocks in (range(start, high + 1), range(start - 1, low - 1, -1)):
+                    for block in blocks:
+                        gap = _gap(block, point, size)
+                        if len(best) == count and fixedGap * fixedGap + gap * gap > -best[0][0]:
+                            break
+
+                        cells = self.blocks.get((block, fixed) if alongX else (fixed, block))
+                        if cells:
+                            visited += 1
+                            self._collectNearest(cells, x, z, count, best, seen)
+
+            if visited >= len(self.blocks):
+                break
+
+            reach = _reach(x, z, centerX, centerZ, radius, size, extent)
+            if reach is None or (len(best) == count and reach * reach >= -best[0][0]):
+                break
+
+            radius += 1
+
+        return [polygonId for _, polygonId in best]
+
+    def _collectNearest(self, cells: set[tuple[int, int]], x: float, z: float, count: int,
+                        best: list[tuple[float, int]], seen: set[int]):
+        size = self.chunkSize
+        limit = -best[0][0] if len(best) == count else inf
+
+        ordered = []
+        for cellX, cellZ in cells:
+            cellDistance = _gap(cellX, x, size) ** 2 + _gap(cellZ, z, size) ** 2
+            if cellDistance <= limit:
+                ordered.append((cellDistance, cellX, cellZ))
+        ordered.sort()
+
+        for cellDistance, cellX, cellZ in ordered:
+            if len(best) == count and cellDistance > -best[0][0]:
+                return
+
+            for polygonId in self.cells[(cellX, cellZ)]:
+                if polygonId in seen:
+                    continue
+                seen.add(polygonId)
+
+                _keepNearest(best, count, polygonId, self.boxes[polygonId], x, z)
+
+    def queryBox(self, minX: float, minY: float, minZ: float,
+                 maxX: float, maxY: float, maxZ: float) -> Iterable[int]:
+        seen = set()
+        for cell in self._cellRange(minX, minZ, maxX, maxZ):
+            for polygonId in self.cells.get(cell, ()):
+                if polygonId not in seen:
+                    seen.add(polygonId)
+                    yield polygonId
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class TiledBackend(SpatialBackend):
+    def __init__(self, tileSize: int, factory: Callable[[], SpatialBackend]):
+        self.tileSize = tileSize
+        self.factory = factory
+        self.children: dict[tuple[int, int], SpatialBackend] = {}
+        self.members: dict[tuple[int, int], set[int]] = {}
+        self.boxes: dict[int, tuple] = {}
+        self.tileCounts: dict[int, int] = {}
+        self.extent: Optional[tuple[int, int, int, int]] = None
+
+        probe = factory()
+        self.exact = probe.exact
+        probe.close()
+
+    def _tiles(self, minX: float, minZ: float, maxX: float, maxZ: float):
+        size = self.tileSize
+        for tileX in range(int(minX // size), int(maxX // size) + 1):
+            for tileZ in range(int(minZ // size), int(maxZ // size) + 1):
+                yield tileX, tileZ
+
+    def _add(self, tile: tuple[int, int], polygonId: int, bounds: tuple):
+        child = self.children.get(tile)
+        if child is None:
+            child = self.children[tile] = self.factory()
+            self.members[tile] = set()
+
+            tileX, tileZ = tile
+            if self.extent is None:
+                self.extent = (tileX, tileZ, tileX, tileZ)
+            else:
+                minX, minZ, maxX, maxZ = self.extent
+                self.extent = (min(tileX, minX), min(tileZ, minZ), max(tileX, maxX), max(tileZ, maxZ))
+
+        polygonIds = self.members[tile]
+        if polygonId in polygonIds:
+            return
+
+        child.insert(polygonId, bounds)
+        polygonIds.add(polygonId)
+        self.boxes[polygonId] = (bounds[0], bounds[2], bounds[3], bounds[5])
+        self.tileCounts[polygonId] = self.tileCounts.get(polygonId, 0) + 1
+
+    def _release(self, polygonId: int):
+        remaining = self.tileCounts[polygonId] - 1
+        if remaining:
+            self.tileCounts[polygonId] = remaining
+        else:
+            del self.tileCounts[polygonId]
+            del self.boxes[polygonId]
+
+    def insert(self, polygonId: int, bounds: tuple):
+        minX, _, minZ, maxX, _, maxZ = bounds
+        for tile in self._tiles(minX, minZ, maxX, maxZ):
+            self._add(tile, polygonId, bounds)
+
+    def delete(self, polygonId: int, bounds: tuple):
+        minX, _, minZ, maxX, _, maxZ = bounds
+        for tile in self._tiles(minX, minZ, maxX, maxZ):
+            polygonIds = self.members.get(tile)
+            if polygonIds is None or polygonId not in polygonIds:
+                continue
+
+            if len(polygonIds) == 1:
+                self.dropTile(*tile)
+                continue
+
+            self.children[tile].delete(polygonId, bounds)
+            polygonIds.discard(polygonId)
+            self._release(polygonId)
+
+    def insertTile(self, tileX: int, tileZ: int, polygonId: int, bounds: tuple):
+        self._add((tileX, tileZ), polygonId, bounds)
+
+    def dropTile(self, tileX: int, tileZ: int):
+        child = self.children.pop((tileX, tileZ), None)
+        if child is None:
+            return
+
+        child.close()
+        for polygonId in self.members.pop((tileX, tileZ)):
+            self._release(polygonId)
+
+    def queryPoint(self, x: float, y: float, z: float) -> Iterable[int]:
+        child = self.children.get((int(x // self.tileSize), int(z // self.tileSize)))
+        return child.queryPoint(x, y, z) if child is not None else ()
+
+    def queryBox(self, minX: float, minY: float, minZ: float,
+                 maxX: float, maxY: float, maxZ: float) -> Iterable[int]:
+        seen = set()
+        for tile in self._tiles(minX, minZ, maxX, maxZ):
+            child = self.children.get(tile)
+            if child is None:
+                continue
+
+            for polygonId in child.queryBox(minX, minY, minZ, maxX, maxY, maxZ):
+                if polygonId not in seen:
+                    seen.add(polygonId)
+                    yield polygonId
+
+    def isEmpty(self, minX: float, minY: float, minZ: float,
+                maxX: float, maxY: float, maxZ: float) -> bool:
+        for tile in self._tiles(minX, minZ, maxX, maxZ):
+            child = self.children.get(tile)
+            if child is not None and not child.isEmpty(minX, minY, minZ, maxX, maxY, maxZ):
+                return False
+        return True
+
+    def nearest(self, x: float, z: float, count: int) -> Iterable[int]:
+        if not self.children or count <= 0:
+            return ()
+        if len(self.boxes) <= count:
+            return list(self.boxes)
+
+        size = self.tileSize
+        centerX, centerZ = int(x // size), int(z // size)
+        minTileX, minTileZ, maxTileX, maxTileZ = self.extent
+
+        best: list[tuple[float, int]] = []
+        seen: set[int] = set()
+        visited = 0
+
+        radius = max(0, minTileX - centerX, centerX - maxTileX, minTileZ - centerZ, centerZ - maxTileZ)
+        while True:
+            for alongX, fixed, low, high in _ring(centerX, centerZ, radius, self.extent):
+                for tile in range(low, high + 1):
+                    tileX, tileZ = (tile, fixed) if alongX else (fixed, tile)
+                    child = self.children.get((tileX, tileZ))
+                    if child is None:
+                        continue
+
+                    visited += 1
+                    gap = _gap(tileX, x, size) ** 2 + _gap(tileZ, z, size) ** 2
+                    if len(best) == count and gap > -best[0][0]:
+                        continue
+
+                    for polygonId in child.nearest(x, z, count):
+                        if polygonId not in seen:
+                            seen.add(polygonId)
+                            _keepNearest(best, count, polygonId, self.boxes[polygonId], x, z)
+
+            if visited >= len(self.children):
+                break
+
+            reach = _reach(x, z, centerX, centerZ, radius, size, self.extent)
+            if reach is None or (len(best) == count and reach * reach >= -best[0][0]):
+                break
+
+            radius += 1
+
+        return [polygonId for _, polygonId in best]
+
+    def close(self):
+        for child in self.children.values():
+            child.close()
+
+    def __len__(self) -> int:
+        return len(self.tileCounts)
+
+
+SPATIAL_BACKENDS = ("rtree", "chunkGrid")
+
+
+def createSpatialBackend(name: str, indexDimension: int = 2, chunkSize: int = 16, tileSize: int = 0) -> SpatialBackend:
+    if tileSize:
+        return TiledBackend(tileSize, lambda: createSpatialBackend(name, indexDimension, chunkSize))
+
+    if name == "rtree":
+        return RTreeBackend(indexDimension)
+
+    elif name == "chunkGrid":
+        return ChunkGridBackend(chunkSize)
+
+    raise ValueError(f"Unknown spatial backend: {name}")
@@ -0,0 +1,362 @@
+import queue
+import threading
+
+from collections import OrderedDict
+from functools import partial
+from math import inf
+from typing import Iterable, Iterator, Optional
+
+from endstone.plugin import Plugin
+
+from .polygonRecord import PolygonRecord
+
+from ..database.engine import DatabaseEngine
+from ..database.repository import PolygonRepository
+
+
+POLYGON_BYTES = {"rtree": 768, "chunkGrid": 2112}
+TILE_BYTES = {"rtree": 17408, "chunkGrid": 512}
+MISS_POLICIES = ("load", "deny")
+
+
+class TileCache:
+    def __init__(self, plugin: Plugin, dbEngine: DatabaseEngine, cache, config: Optional[dict] = None):
+        lazyConfig: dict = (config or {}).get("cache", {}).get("lazy", {})
+
+        self._plugin = plugin
+        self._dbEngine = dbEngine
+        self._cache = cache
+
+        self.tileSize: int = lazyConfig.get("tileSize", 512)
+        self.memoryBudget: float = lazyConfig.get("memoryBudget", 64)
+        self.missPolicy: str = lazyConfig.get("missPolicy", "load")
+        self.preloadRadius: int = lazyConfig.get("preloadRadius", 1)
+        self.preloadInterval: float = lazyConfig.get("preloadInterval", 2)
+
+        if self.tileSize <= 0 or self.tileSize % 16:
+            raise ValueError(f"Tile size must be a positive multiple of 16: {self.tileSize}")
+        if self.missPolicy not in MISS_POLICIES:
+            raise ValueError(f"Unknown tile miss policy: {self.missPolicy}")
+
+        self.budgetBytes = int(self.memoryBudget * 1024 * 1024)
+        self.polygonBytes = POLYGON_BYTES.get(cache.backend, 1024)
+        self.tileBytes = TILE_BYTES.get(cache.backend, 1024)
+        self.pending = PolygonRecord(
+            0, lazyConfig.get("pendingName", "area still loading"), "", "", -1, (0, 0, 0, 0, 0, 0), (0, 0, 0)
+        )
+
+        self.tiles: OrderedDict[tuple[int, int, int], set[int]] = OrderedDict()
+        self.pinnedOwners: set[str] = set()
+
+        self._removed: dict[int, tuple[int, Optional[int]]] = {}
+        self._requested: set[tuple] = set()
+        self._protected: set[tuple[int, int, int]] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.evictions = 0
+
+        self._fetched = 0
+        self._applied = 0
+
+        self._task = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="PolygonsTileLoader", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+        for player in self._plugin.server.online_players:
+            self.pinOwner(player.name)
+
+        period = max(1, int(self.preloadInterval * 20))
+        self._task = self._plugin.server.scheduler.run_task(self._plugin, self._sweep, delay=period, period=period)
+
+    def stop(self, timeout: float = 5.0):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def _tileRange(self, worldId: int, minX: float, minZ: float, maxX: float, maxZ: float) -> Iterator[tuple]:
+        size = self.tileSize
+        for tileX in range(int(minX // size), int(maxX // size) + 1):
+            for tileZ in range(int(minZ // size), int(maxZ // size) + 1):
+                yield (worldId, tileX, tileZ)
+
+    def tileKeys(self, record: PolygonRecord) -> Iterator[tuple]:
+        return self._tileRange(record.worldId, record.minX, record.minZ, record.maxX, record.maxZ)
+
+    def holds(self, record: PolygonRecord) -> bool:
+        if record.owner in self.pinnedOwners:
+            return True
+        return any(key in self.tiles for key in self.tileKeys(record))
+
+    def track(self, record: PolygonRecord):
+        for key in self.tileKeys(record):
+            polygonIds = self.tiles.get(key)
+            if polygonIds is not None:
+                polygonIds.add(record.id)
+
+    def untrack(self, record: PolygonRecord):
+        for key in self.tileKeys(record):
+            polygonIds = self.tiles.get(key)
+            if polygonIds is not None:
+                polygonIds.discard(record.id)
+
+    def forget(self, polygonId: int):
+        writeQueue = self._dbEngine.writeQueue
+        self._removed[polygonId] = (writeQueue.queued if writeQueue else 0, None)
+
+    def revive(self, polygonId: int):
+        self._removed.pop(polygonId, None)
+
+    def _pruneTombstones(self):
+        writeQueue = self._dbEngine.writeQueue
+        written = writeQueue.written if writeQueue else inf
+
+        for polygonId, (queued, fetched) in list(self._removed.items()):
+            if fetched is None:
+                if written < queued:
+                    continue
+
+                fetched = self._fetched
+                self._removed[polygonId] = (queued, fetched)
+
+            if self._applied >= fetched:
+                del self._removed[polygonId]
+
+    def ensurePoint(self, worldId: int, x: float, z: float) -> bool:
+        key = (worldId, int(x // self.tileSize), int(z // self.tileSize))
+        if key in self.tiles:
+            self.tiles.move_to_end(key)
+            self.hits += 1
+            return True
+
+        return self.ensureArea(worldId, x, z, x, z)
+
+    def ensureArea(self, worldId: int, minX: float, minZ: float, maxX: float, maxZ: float,
+                   wait: bool = False) -> bool:
+        keys = list(self._tileRange(worldId, minX, minZ, maxX, maxZ))
+        ready = True
+        loaded = False
+
+        for key in keys:
+            if key in self.tiles:
+                self.tiles.move_to_end(key)
+                self.hits += 1
+                continue
+
+            self.misses += 1
+            if wait or self.missPolicy == "load":
+                self._loadNow(key)
+                loaded = True
+            else:
+                self._request(("tile", key))
+                ready = False
+
+        if loaded:
+            self._evict(keys)
+            ready = ready and all(key in self.tiles for key in keys)
+        return ready
+
+    def pinOwner(self, owner: str):
+        if owner in self.pinnedOwners:
+            return
+
+        self.pinnedOwners.add(owner)
+        self._request(("owner", owner))
+
+    def unpinOwner(self, owner: str):
+        if owner not in self.pinnedOwners:
+            return
+
+        self.pinnedOwners.discard(owner)
+        cache = self._cache
+        for polygonId in list(cache.polygonIdsByOwner.get(owner, ())):
+            record = cache.polygons.get(polygonId)
+            if record and not self.holds(record):
+                cache._dropRecord(polygonId)
+
+    def _request(self, item: tuple):
+        if item not in self._requested:
+            self._requested.add(item)
+            self._queue.put(item)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            self._fetched += 1
+            try:
+                rows, members = self._fetch(item)
+            except Exception as error:
+                self._runOnServer(self._fail, item, error)
+                continue
+
+            self._runOnServer(self._apply, item, rows, members)
+
+    def _fetch(self, item: tuple) -> tuple[list, dict[int, list[str]]]:
+        kind, value = item
+        if kind == "tile":
+            worldId, tileX, tileZ = value
+            size = self.tileSize
+            filters = {"region": (
+                self._cache.worldNames[worldId],
+                tileX * size, tileZ * size, (tileX + 1) * size - 1, (tileZ + 1) * size - 1
+            )}
+        else:
+            filters = {"owner": value}
+
+        session = self._dbEngine.getSession()
+        try:
+            repository = PolygonRepository(session)
+            rows = list(repository.streamPolygonRows(**filters))
+
+            members: dict[int, list[str]] = {}
+            if rows:
+                for row in repository.streamMemberRows(polygonIds=[row.id for row in rows]):
+                    members.setdefault(row.polygonId, []).append(row.playerName)
+        finally:
+            session.close()
+
+        return rows, members
+
+    def _loadNow(self, key: tuple):
+        rows, members = self._fetch(("tile", key))
+        self._installTile(key, rows, members)
+
+    def _apply(self, item: tuple, rows: list, members: dict[int, list[str]]):
+        self._requested.discard(item)
+        self._applied += 1
+
+        kind, value = item
+        if kind == "tile":
+            self._installTile(value, rows, members)
+        elif value in self.pinnedOwners:
+            self._installRows(rows, members)
+
+        self._evict([value] if kind == "tile" else ())
+
+    def _fail(self, item: tuple, error: Exception):
+        self._requested.discard(item)
+        self._applied += 1
+        self._plugin.logger.error(f"Failed to load polygons for {item[0]} {item[1]}: {error}")
+
+    def _installRows(self, rows: list, members: dict[int, list[str]]):
+        cache = self._cache
+        for row in rows:
+            if row.id in cache.polygons or row.id in self._removed:
+                continue
+
+            worldId = cache.getWorldId(row.world)
+            cache._indexRecord(PolygonRecord.fromRow(row, cache.worldNames[worldId], worldId, members.get(row.id)))
+
+    def _installTile(self, key: tuple, rows: list, members: dict[int, list[str]]):
+        if key in self.tiles:
+            return
+
+        worldId, tileX, tileZ = key
+        size = self.tileSize
+        minX, minZ = tileX * size, tileZ * size
+        maxX, maxZ = minX + size - 1, minZ + size - 1
+
+        cache = self._cache
+        spatialIndex = cache._getOrCreateSpatialIndex(worldId)
+        present = set(spatialIndex.queryBox(minX, -inf, minZ, maxX, inf, maxZ))
+
+        polygonIds = self.tiles[key] = set()
+        for row in rows:
+            if row.id in self._removed:
+                continue
+
+            record = cache.polygons.get(row.id)
+            if record is None:
+                record = PolygonRecord.fromRow(row, cache.worldNames[worldId], worldId, members.get(row.id))
+                cache._indexRecord(record)
+            elif row.id not in present:
+                spatialIndex.insertTile(tileX, tileZ, record.id, record.bounds)
+
+            polygonIds.add(row.id)
+
+        polygonIds.update(polygonId for polygonId in present if polygonId in cache.polygons)
+
+        cache.lookupMemo.invalidate()
+        self.loads += 1
+
+    def residentBytes(self) -> int:
+        return len(self._cache.polygons) * self.polygonBytes + len(self.tiles) * self.tileBytes
+
+    def pinnedPolygons(self) -> int:
+        polygonIdsByOwner = self._cache.polygonIdsByOwner
+        return sum(len(polygonIdsByOwner.get(owner, ())) for owner in self.pinnedOwners)
+
+    def _evict(self, keep: Iterable[tuple] = ()):
+        limit = self.budgetBytes + self.pinnedPolygons() * self.polygonBytes
+        if self.residentBytes() <= limit:
+            return
+
+        keep = set(keep)
+        cache = self._cache
+        for key in list(self.tiles):
+            if self.residentBytes() <= limit:
+                break
+            if key in self._protected or key in keep:
+                continue
+
+            worldId, tileX, tileZ = key
+            spatialIndex = cache.spatialIndexes.get(worldId)
+            if spatialIndex is not None:
+                spatialIndex.dropTile(tileX, tileZ)
+
+            for polygonId in self.tiles.pop(key):
+                record = cache.polygons.get(polygonId)
+                if record and not self.holds(record):
+                    cache._dropRecord(polygonId)
+            self.evictions += 1
+
+    def _sweep(self):
+        cache = self._cache
+        reach = self.preloadRadius * self.tileSize
+        protected = set()
+
+        for player in self._plugin.server.online_players:
+            location = player.location
+            worldId = cache.getWorldId(location.dimension.name)
+
+            for key in self._tileRange(worldId, location.x - reach, location.z - reach,
+                                       location.x + reach, location.z + reach):
+                protected.add(key)
+                if key in self.tiles:
+                    self.tiles.move_to_end(key)
+                else:
+                    self._request(("tile", key))
+
+        self._protected = protected
+        self._evict()
+        self._pruneTombstones()
+
+    def _runOnServer(self, task, *args):
+        self._plugin.server.scheduler.run_task(self._plugin, partial(task, *args))
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "tiles": len(self.tiles),
+            "polygons": len(self._cache.polygons),
+            "pinned": self.pinnedPolygons(),
+            "memory": self.residentBytes(),
+            "budget": self.budgetBytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / total if total else 0.0,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "pending": len(self._requested)
+        }
@@ -16,12 +16,76 @@ class PolygonCommand(CommandExecutor):
         self.dbEngine = plugin._dbEngine
 
     def on_command(self, sender: CommandSender, command: Command, args: List[str]) -> bool:
+        if args and args[0] == "stats":
+            self._sendStats(sender)
+            return True
+        
         if not isinstance(sender, Player):
             sender.send_message("This command is not for console")
             return
 
         player: Player = sender
+        
+        if args and args[0] == "borders":
+            self._showBorders(player)
+            return True
+        
         player.play_sound(player.location, "random.pop")
         
         menuForm = MenuPolygonForm(self.cache, self.dbEngine, self.config, player)
-        player.send_form(menuForm.form)
\ No newline at end of file
+        player.send_form(menuForm.form)
+        
+    def _showBorders(self, player: Player) -> None:
+        messages: dict = self.config.get("messages")
+        renderer = self.plugin._borderRenderer
+        
+        location = player.location
+        distance = renderer.viewDistance
+        polygons = self.cache.findPolygonsInRegion(
+            location.dimension.name,
+            location.x - distance, location.y - distance, location.z - distance,
+            location.x + distance, location.y + distance, location.z + distance
+        )
+        
+        if not polygons:
+            player.send_message(messages.get("noPolygonsNearby", "There are no polygons near you"))
+            return
+        
+        for polygon in polygons:
+            renderer.show(player, polygon)
+        
+        player.play_sound(player.location, "random.pop")
+        player.send_message(messages.get("bordersShown", "Showing borders of {count} polygons nearby").format(count=len(polygons)))
+        
+    def _sendStats(self, sender: CommandSender) -> None:
+        messages: dict = self.config.get("messages")
+        
+        if not sender.has_permission("polygon.command.stats"):
+            sender.send_message(messages.get("noPermission", "You do not have permission to use this command"))
+            return
+        
+        metrics = self.plugin._metrics
+        if metrics is None:
+            lines = [messages.get(
+                "timingsDisabled", "Timings are disabled. Set enabled = true in the [metrics] section of config.toml"
+            )]
+        else:
+            lines = metrics.summary()
+        
+        memo = self.cache.lookupMemo.stats()
+        lines.append(
+            f"Polygons: {len(self.cache.polygons)}, lookup memo hit rate {memo['hitRate']:.1%}, "
+            f"permission decisions {len(self.cache.permissions)}, "
+            f"pending writes {self.dbEngine.writeQueue.pending if self.dbEngine.writeQueue else 0}"
+        )
+        
+        if self.cache.tiles:
+            tiles = self.cache.tiles.stats()
+            lines.append(
+                f"Tiles: {tiles['tiles']} resident, hit rate {tiles['hitRate']:.1%} "
+                f"({tiles['hits']} hits, {tiles['misses']} misses), {tiles['loads']} loads, "
+                f"{tiles['evictions']} evictions, {tiles['pending']} pending, "
+                f"{tiles['polygons']} polygons ({tiles['pinned']} pinned), ~{tiles['memory'] / 1048576:.1f}/{tiles['budget'] / 1048576:.0f} MiB"
+            )
+        
+        sender.send_message("\n".join(lines))
@@ -1,6 +1,7 @@
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, Session
 
 from .models import Base
@@ -10,6 +11,12 @@ class DatabaseEngine:
     def __init__(self, config: dict, dbPath: str):
         dbConfig: dict = config.get("database")
         dbType = dbConfig.get("type")
+        poolConfig: dict = dbConfig.get("pool", {})
+        
+        self.dbType = dbType
+        self.pragmas: dict = {}
+        self.spatialIndex = False
+        self.sessionInfo: dict = {}
         
         if dbType == "sqlite":
             sqliteConfig: dict = dbConfig.get("sqlite")
@@ -18,6 +25,8 @@ class DatabaseEngine:
             self.dbPath = Path(dbPath) if dbPath else Path(filename)
 
             connection = f"sqlite:///{self.dbPath}"
+            self.pragmas = sqliteConfig.get("pragmas", {})
+            self.spatialIndex = sqliteConfig.get("spatialIndex", False)
             
         elif dbType == "mysql":
             mysqlConfig: dict = dbConfig.get("mysql")
@@ -43,15 +52,86 @@ class DatabaseEngine:
 
             connection = f"postgresql+psycopg2://{username}:{password}@{host}:{port}/{database}"
                         
-        self.engine = create_engine(connection, echo=False)
-        self.sessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
+        self.engine = create_engine(
+            connection,
+            echo=False,
+            pool_size=poolConfig.get("size", 5),
+            max_overflow=poolConfig.get("maxOverflow", 10),
+            pool_timeout=poolConfig.get("timeout", 30),
+            pool_recycle=poolConfig.get("recycle", 1800) if dbType != "sqlite" else -1,
+            pool_pre_ping=poolConfig.get("prePing", True) and dbType != "sqlite"
+        )
+        
+        if dbType == "sqlite":
+            event.listen(self.engine, "connect", self._applyPragmas)
+        
+        self.sessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False, info=self.sessionInfo)
+        
+        self.writeQueue = None
+        
+    def _applyPragmas(self, dbapiConnection, connectionRecord):
+        cursor = dbapiConnection.cursor()
+        try:
+            cursor.execute("PRAGMA foreign_keys=ON")
+            for name, value in self.pragmas.items():
+                if not name.isidentifier():
+                    raise ValueError(f"Invalid SQLite pragma: {name}")
+                cursor.execute(f"PRAGMA {name}={value!r}" if isinstance(value, str) else f"PRAGMA {name}={int(value)}")
+        finally:
+            cursor.close()
+    
+    def getPragmas(self) -> dict:
+        with self.engine.connect() as connection:
+            return {
+                name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+                for name in self.pragmas
+            }
+    
+    def enableMetrics(self, metrics):
+        self.sessionInfo["metrics"] = metrics
+    
+    def enableChangeLog(self):
+        self.sessionInfo["changeLog"] = True
+    
+    def getPoolStatus(self) -> str:
+        return self.engine.pool.status()
+    
+    def createTables(self) -> list[tuple[int, str]]:
+        from .migrations import MigrationRunner
         
-    def createTables(self):
         Base.metadata.create_all(self.engine)
+        applied = MigrationRunner(self).run()
+        
+        if self.dbType == "sqlite":
+            self._syncSpatialIndex()
+        return applied
+    
+    def _syncSpatialIndex(self):
+        from .spatialIndex import createSpatialIndex, dropSpatialIndex, SPATIAL_TABLE
+        
+        if not self.spatialIndex:
+            with self.engine.begin() as connection:
+                dropSpatialIndex(connection)
+            return
+        
+        try:
+            with self.engine.begin() as connection:
+                createSpatialIndex(connection)
+        except OperationalError:
+            self.spatialIndex = False
+            return
         
+        self.sessionInfo["spatialIndex"] = SPATIAL_TABLE
+    
     def getSession(self) -> Session:
         return self.sessionLocal()
     
+    def startWriteQueue(self, plugin, maxSize: int = 1000, batchSize: int = 100):
+        from .writeQueue import WriteBehindQueue
+        
+        self.writeQueue = WriteBehindQueue(plugin, self, maxSize, batchSize)
+        self.writeQueue.start()
+    
     def __enter__(self) -> Session:
         self._session = self.sessionLocal()
         return self._session
@@ -62,4 +142,7 @@ class DatabaseEngine:
         return False
     
     def close(self):
+        if self.writeQueue:
+            self.writeQueue.stop()
+        
         self.engine.dispose()
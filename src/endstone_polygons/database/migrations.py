@@ -0,0 +1,151 @@
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import MetaData, delete, func, inspect, select, text
+from sqlalchemy.exc import IntegrityError
+
+from .models import Polygon, PolygonCoordinates, PolygonFlags, PolygonMember, SchemaMigration
+
+
+CASCADE_TABLES = (PolygonCoordinates.__table__, PolygonFlags.__table__, PolygonMember.__table__)
+
+MIGRATIONS: list[tuple[int, str, Callable]] = []
+
+
+def migration(version: int, description: str) -> Callable:
+    def register(function: Callable) -> Callable:
+        MIGRATIONS.append((version, description, function))
+        MIGRATIONS.sort(key=lambda entry: entry[0])
+        return function
+    return register
+
+
+@migration(1, "Add polygonFlags.allowExplosions")
+def addExplosionsFlag(dbEngine):
+    columns = {column["name"] for column in inspect(dbEngine.engine).get_columns("polygonFlags")}
+    if "allowExplosions" in columns:
+        return
+    
+    quote = dbEngine.engine.dialect.identifier_preparer.quote
+    with dbEngine.engine.begin() as connection:
+        connection.execute(text(
+            f"ALTER TABLE {quote('polygonFlags')} ADD COLUMN {quote('allowExplosions')} BOOLEAN DEFAULT FALSE"
+        ))
+
+
+@migration(2, "Cascade polygon deletes to coordinates, flags and members")
+def addCascades(dbEngine):
+    inspector = inspect(dbEngine.engine)
+    tables = [
+        table for table in CASCADE_TABLES
+        if any(foreignKey["referred_table"] == Polygon.__tablename__ and
+               (foreignKey.get("options") or {}).get("ondelete", "").upper() != "CASCADE"
+               for foreignKey in inspector.get_foreign_keys(table.name))
+    ]
+    if not tables:
+        return
+    
+    if dbEngine.dbType == "sqlite":
+        _rebuildSqliteTables(dbEngine, tables)
+    else:
+        _replaceForeignKeys(dbEngine, tables, inspector)
+
+
+def _rebuildSqliteTables(dbEngine, tables: list):
+    quote = dbEngine.engine.dialect.identifier_preparer.quote
+    metadata = MetaData()
+    Polygon.__table__.to_metadata(metadata)
+    
+    with dbEngine.engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        try:
+            for table in tables:
+                temporary = table.to_metadata(metadata, name=f"{table.name}Migrating")
+                for index in list(temporary.indexes):
+                    temporary.indexes.discard(index)
+                temporary.create(connection)
+                
+                columns = ", ".join(quote(column.name) for column in table.columns)
+                connection.exec_driver_sql(
+                    f"INSERT INTO {quote(temporary.name)} ({columns}) SELECT {columns} FROM {quote(table.name)} "
+                    f"WHERE {quote('polygonId')} IN (SELECT {quote('id')} FROM {quote(Polygon.__tablename__)})"
+                )
+                connection.exec_driver_sql(f"DROP TABLE {quote(table.name)}")
+                connection.exec_driver_sql(f"ALTER TABLE {quote(temporary.name)} RENAME TO {quote(table.name)}")
+            connection.commit()
+        finally:
+            connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+
+
+def _replaceForeignKeys(dbEngine, tables: list, inspector):
+    quote = dbEngine.engine.dialect.identifier_preparer.quote
+    dropKeyword = "FOREIGN KEY" if dbEngine.dbType == "mysql" else "CONSTRAINT"
+    
+    with dbEngine.engine.begin() as connection:
+        for table in tables:
+            connection.execute(text(
+                f"DELETE FROM {quote(table.name)} WHERE {quote('polygonId')} NOT IN "
+                f"(SELECT {quote('id')} FROM {quote(Polygon.__tablename__)})"
+            ))
+            
+            for foreignKey in inspector.get_foreign_keys(table.name):
+                if foreignKey["referred_table"] != Polygon.__tablename__:
+                    continue
+                
+                name = foreignKey["name"]
+                connection.execute(text(f"ALTER TABLE {quote(table.name)} DROP {dropKeyword} {quote(name)}"))
+                connection.execute(text(
+                    f"ALTER TABLE {quote(table.name)} ADD CONSTRAINT {quote(name)} "
+                    f"FOREIGN KEY ({quote('polygonId')}) REFERENCES {quote(Polygon.__tablename__)} ({quote('id')}) "
+                    f"ON DELETE CASCADE"
+                ))
+
+
+@migration(3, "Remove duplicate polygon members")
+def dedupeMembers(dbEngine):
+    members = PolygonMember.__table__
+    keep = (
+        select(func.min(members.c.id).label("id"))
+        .group_by(members.c.polygonId, members.c.playerName)
+        .subquery("keep")
+    )
+    
+    with dbEngine.engine.begin() as connection:
+        connection.execute(delete(members).where(members.c.id.not_in(select(keep.c.id))))
+
+
+@migration(4, "Index polygon owner and world, make members unique per polygon")
+def addLookupIndexes(dbEngine):
+    with dbEngine.engine.begin() as connection:
+        for table in (Polygon.__table__, PolygonMember.__table__):
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+
+class MigrationRunner:
+    def __init__(self, dbEngine):
+        self.dbEngine = dbEngine
+    
+    def currentVersion(self) -> int:
+        with self.dbEngine.engine.connect() as connection:
+            return connection.execute(select(func.max(SchemaMigration.version))).scalar() or 0
+    
+    def pending(self) -> list[tuple[int, str, Callable]]:
+        current = self.currentVersion()
+        return [entry for entry in MIGRATIONS if entry[0] > current]
+    
+    def run(self) -> list[tuple[int, str]]:
+        applied = []
+        for version, description, function in self.pending():
+            function(self.dbEngine)
+            
+            try:
+                with self.dbEngine.engine.begin() as connection:
+                    connection.execute(SchemaMigration.__table__.insert().values(
+                        version=version, description=description, appliedAt=datetime.utcnow()
+                    ))
+            except IntegrityError:
+                continue
+            
+            applied.append((version, description))
+        return applied
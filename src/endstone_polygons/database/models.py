@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Boolean
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -13,20 +13,20 @@ class Polygon(Base):
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String, unique=True, nullable=False)
-    owner: Mapped[str] = mapped_column(String, nullable=False)
-    world: Mapped[str] = mapped_column(String, nullable=False)
+    owner: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    world: Mapped[str] = mapped_column(String, nullable=False, index=True)
     
     createdAt: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updatedAt: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     coordinates: Mapped["PolygonCoordinates"] = relationship(
-        "PolygonCoordinates", back_populates="polygon", uselist=False, cascade="all, delete-orphan"
+        "PolygonCoordinates", back_populates="polygon", uselist=False, cascade="all, delete-orphan", passive_deletes=True
     )
     flags: Mapped["PolygonFlags"] = relationship(
-        "PolygonFlags", back_populates="polygon", uselist=False, cascade="all, delete-orphan"
+        "PolygonFlags", back_populates="polygon", uselist=False, cascade="all, delete-orphan", passive_deletes=True
     )
     members: Mapped[list["PolygonMember"]] = relationship(
-        "PolygonMember", back_populates="polygon", cascade="all, delete-orphan"
+        "PolygonMember", back_populates="polygon", cascade="all, delete-orphan", passive_deletes=True
     )
     
     def __repr__(self) -> str:
@@ -38,7 +38,7 @@ class PolygonCoordinates(Base):
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     polygonId: Mapped[int] = mapped_column(
-        Integer, ForeignKey("polygons.id"), nullable=False, unique=True
+        Integer, ForeignKey("polygons.id", ondelete="CASCADE"), nullable=False, unique=True
     )
     
     minX: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -63,12 +63,13 @@ class PolygonFlags(Base):
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     polygonId: Mapped[int] = mapped_column(
-        Integer, ForeignKey("polygons.id"), nullable=False, unique=True
+        Integer, ForeignKey("polygons.id", ondelete="CASCADE"), nullable=False, unique=True
     )
     
     canBreak: Mapped[bool] = mapped_column(Boolean, default=False)
     canPlace: Mapped[bool] = mapped_column(Boolean, default=False)
     canOpenChests: Mapped[bool] = mapped_column(Boolean, default=False)
+    allowExplosions: Mapped[bool] = mapped_column(Boolean, default=False)
 
     polygon: Mapped["Polygon"] = relationship("Polygon", back_populates="flags")
     
@@ -78,9 +79,12 @@ class PolygonFlags(Base):
 
 class PolygonMember(Base):
     __tablename__ = "polygonMembers"
+    __table_args__ = (
+        Index("ix_polygonMembers_polygonId_playerName", "polygonId", "playerName", unique=True),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    polygonId: Mapped[int] = mapped_column(Integer, ForeignKey("polygons.id"), nullable=False)
+    polygonId: Mapped[int] = mapped_column(Integer, ForeignKey("polygons.id", ondelete="CASCADE"), nullable=False)
     playerName: Mapped[str] = mapped_column(String, nullable=False)
     
     addedAt: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -89,3 +93,29 @@ class PolygonMember(Base):
     
     def __repr__(self) -> str:
         return f"<PolygonMember(id={self.id}, player='{self.playerName}', polygonId={self.polygonId})>"
+
+
+class PolygonChange(Base):
+    __tablename__ = "polygonChanges"
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    polygonId: Mapped[int] = mapped_column(Integer, nullable=False)
+    action: Mapped[str] = mapped_column(String, nullable=False)
+    
+    createdAt: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    
+    def __repr__(self) -> str:
+        return f"<PolygonChange(id={self.id}, polygonId={self.polygonId}, action='{self.action}')>"
+
+
+class SchemaMigration(Base):
+    __tablename__ = "schemaMigrations"
+    
+    version: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    description: Mapped[str] = mapped_column(String, nullable=False)
+    
+    appliedAt: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self) -> str:
+        return f"<SchemaMigration(version={self.version}, description='{self.description}')>"
@@ -1,20 +1,35 @@
-from typing import Optional
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
 
+from sqlalchemy import select, func, insert, update, delete, or_
 from sqlalchemy.orm import Session, joinedload
 
-from .models import Polygon, PolygonCoordinates, PolygonFlags, PolygonMember
+from .models import Polygon, PolygonCoordinates, PolygonFlags, PolygonMember, PolygonChange
+from .spatialIndex import polygonSpatial
+
+from ..metrics.metrics import timedOperation
+
+
+BULK_CHUNK_SIZE = 500
+FLAG_COLUMNS = ("canBreak", "canPlace", "canOpenChests", "allowExplosions")
+
+
+def _chunks(values: list, size: int = BULK_CHUNK_SIZE) -> Iterator[list]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
 
 
 class PolygonRepository:
     def __init__(self, session: Session):
         self.session = session
     
+    @timedOperation
     def createPolygon(self, name: str, owner: str, world: str,
                       centerX: int, centerY: int, centerZ: int,
                       minX: float, minY: float, minZ: float, 
                       maxX: float, maxY: float, maxZ: float,
                       canBreak: bool = False, canPlace: bool = False, 
-                      canOpenChests: bool = False) -> Polygon:
+                      canOpenChests: bool = False, allowExplosions: bool = False) -> Polygon:
         polygon = Polygon(
             name=name,
             owner=owner,
@@ -41,15 +56,55 @@ class PolygonRepository:
             polygonId=polygon.id,
             canBreak=canBreak,
             canPlace=canPlace,
-            canOpenChests=canOpenChests
+            canOpenChests=canOpenChests,
+            allowExplosions=allowExplosions
         )
         self.session.add(flags)
         
+        self.logChange(polygon.id, "create")
         self.session.commit()
         
         self.session.refresh(polygon)
         return polygon
     
+    @timedOperation
+    def createPolygons(self, polygons: list[dict], commit: bool = True) -> list[int]:
+        if not polygons:
+            return []
+        
+        now = datetime.utcnow()
+        self.session.execute(insert(Polygon), [
+            {"name": polygon["name"], "owner": polygon["owner"], "world": polygon["world"],
+             "createdAt": now, "updatedAt": now}
+            for polygon in polygons
+        ])
+        
+        names = [polygon["name"] for polygon in polygons]
+        polygonIds: dict[str, int] = {}
+        for chunk in _chunks(names):
+            polygonIds.update(self.session.execute(
+                select(Polygon.name, Polygon.id).where(Polygon.name.in_(chunk))
+            ).all())
+        
+        self.session.execute(insert(PolygonCoordinates), [
+            {"polygonId": polygonIds[polygon["name"]],
+             **{key: polygon[key] for key in ("centerX", "centerY", "centerZ",
+                                              "minX", "minY", "minZ", "maxX", "maxY", "maxZ")}}
+            for polygon in polygons
+        ])
+        self.session.execute(insert(PolygonFlags), [
+            {"polygonId": polygonIds[polygon["name"]],
+             **{key: polygon.get(key, False) for key in FLAG_COLUMNS}}
+            for polygon in polygons
+        ])
+        
+        createdIds = [polygonIds[name] for name in names]
+        self.logChanges(createdIds, "create")
+        if commit:
+            self.session.commit()
+        return createdIds
+    
+    @timedOperation
     def getPolygonByName(self, name: str) -> Optional[Polygon]:
         return self.session.query(Polygon).options(
             joinedload(Polygon.coordinates),
@@ -57,6 +112,7 @@ class PolygonRepository:
             joinedload(Polygon.members)
         ).filter(Polygon.name == name).first()
     
+    @timedOperation
     def getPolygonById(self, polygonId: int) -> Optional[Polygon]:
         return self.session.query(Polygon).options(
             joinedload(Polygon.coordinates),
@@ -64,19 +120,52 @@ class PolygonRepository:
             joinedload(Polygon.members)
         ).filter(Polygon.id == polygonId).first()
     
-    def getPolygonAtPosition(self, world: str, x: float, z: float) -> Optional[Polygon]:
-        return self.session.query(Polygon).join(PolygonCoordinates).options(
+    def _queryInBox(self, world: str, minX: float, minZ: float, maxX: float, maxZ: float,
+                    minY: Optional[float] = None, maxY: Optional[float] = None):
+        conditions = [
+            PolygonCoordinates.minX <= maxX,
+            PolygonCoordinates.maxX >= minX,
+            PolygonCoordinates.minZ <= maxZ,
+            PolygonCoordinates.maxZ >= minZ
+        ]
+        if minY is not None:
+            conditions += [PolygonCoordinates.minY <= maxY, PolygonCoordinates.maxY >= minY]
+        
+        query = self.session.query(Polygon).join(PolygonCoordinates).options(
             joinedload(Polygon.coordinates),
             joinedload(Polygon.flags),
             joinedload(Polygon.members)
-        ).filter(
-            Polygon.world == world,
-            PolygonCoordinates.minX <= x,
-            PolygonCoordinates.maxX >= x,
-            PolygonCoordinates.minZ <= z,
-            PolygonCoordinates.maxZ >= z
-        ).first()
+        ).filter(Polygon.world == world, *conditions)
+        
+        if self.session.info.get("spatialIndex"):
+            query = query.filter(self._spatialCondition(minX, minZ, maxX, maxZ, minY, maxY))
+        
+        return query
     
+    def _spatialCondition(self, minX: float, minZ: float, maxX: float, maxZ: float,
+                          minY: Optional[float] = None, maxY: Optional[float] = None):
+        conditions = [
+            polygonSpatial.c.minX <= maxX,
+            polygonSpatial.c.maxX >= minX,
+            polygonSpatial.c.minZ <= maxZ,
+            polygonSpatial.c.maxZ >= minZ
+        ]
+        if minY is not None:
+            conditions += [polygonSpatial.c.minY <= maxY, polygonSpatial.c.maxY >= minY]
+        
+        return Polygon.id.in_(select(polygonSpatial.c.id).where(*conditions))
+    
+    @timedOperation
+    def getPolygonAtPosition(self, world: str, x: float, z: float, y: Optional[float] = None) -> Optional[Polygon]:
+        return self._queryInBox(world, x, z, x, z, y, y).first()
+    
+    @timedOperation
+    def getPolygonsInBox(self, world: str,
+                         minX: float, minY: float, minZ: float,
+                         maxX: float, maxY: float, maxZ: float) -> list[Polygon]:
+        return self._queryInBox(world, minX, minZ, maxX, maxZ, minY, maxY).all()
+    
+    @timedOperation
     def getPolygonsByOwner(self, owner: str) -> list[Polygon]:
         return self.session.query(Polygon).options(
             joinedload(Polygon.coordinates),
@@ -84,6 +173,7 @@ class PolygonRepository:
             joinedload(Polygon.members)
         ).filter(Polygon.owner == owner).all()
     
+    @timedOperation
     def getAllPolygons(self) -> list[Polygon]:
         return self.session.query(Polygon).options(
             joinedload(Polygon.coordinates),
@@ -91,15 +181,118 @@ class PolygonRepository:
             joinedload(Polygon.members)
         ).all()
     
-    def deletePolygon(self, polygonId: int) -> bool:
-        polygon = self.getPolygonById(polygonId)
-        if polygon:
-            self.session.delete(polygon)
+    def streamPolygonRows(self, batchSize: int = 1000, polygonIds: Optional[Iterable[int]] = None,
+                          owner: Optional[str] = None, region: Optional[tuple] = None) -> Iterator:
+        query = (
+            select(
+                Polygon.id, Polygon.name, Polygon.owner, Polygon.world,
+                PolygonCoordinates.minX, PolygonCoordinates.minY, PolygonCoordinates.minZ,
+                PolygonCoordinates.maxX, PolygonCoordinates.maxY, PolygonCoordinates.maxZ,
+                PolygonCoordinates.centerX, PolygonCoordinates.centerY, PolygonCoordinates.centerZ,
+                PolygonFlags.canBreak, PolygonFlags.canPlace, PolygonFlags.canOpenChests,
+                PolygonFlags.allowExplosions
+            )
+            .join(PolygonCoordinates, PolygonCoordinates.polygonId == Polygon.id)
+            .outerjoin(PolygonFlags, PolygonFlags.polygonId == Polygon.id)
+        )
+        if polygonIds is not None:
+            query = query.where(Polygon.id.in_(list(polygonIds)))
+        if owner is not None:
+            query = query.where(Polygon.owner == owner)
+        if region is not None:
+            world, minX, minZ, maxX, maxZ = region
+            query = query.where(
+                Polygon.world == world,
+                PolygonCoordinates.minX <= maxX,
+                PolygonCoordinates.maxX >= minX,
+                PolygonCoordinates.minZ <= maxZ,
+                PolygonCoordinates.maxZ >= minZ
+            )
+            if self.session.info.get("spatialIndex"):
+                query = query.where(self._spatialCondition(minX, minZ, maxX, maxZ))
+        
+        result = self.session.execute(query.execution_options(yield_per=batchSize))
+        for partition in result.partitions():
+            yield from partition
+    
+    def streamMemberRows(self, batchSize: int = 1000, polygonIds: Optional[Iterable[int]] = None) -> Iterator:
+        query = select(PolygonMember.polygonId, PolygonMember.playerName)
+        if polygonIds is not None:
+            query = query.where(PolygonMember.polygonId.in_(list(polygonIds)))
+        
+        result = self.session.execute(query.execution_options(yield_per=batchSize))
+        for partition in result.partitions():
+            yield from partition
+    
+    @timedOperation
+    def getVersionStamp(self) -> tuple:
+        polygonCount, lastUpdate = self.session.execute(
+            select(func.count(Polygon.id), func.max(Polygon.updatedAt))
+        ).one()
+        memberCount = self.session.execute(select(func.count(PolygonMember.id))).scalar()
+        
+        return (polygonCount, memberCount, lastUpdate.isoformat() if lastUpdate else None)
+    
+    def touchPolygon(self, polygonId: int):
+        self.session.execute(
+            update(Polygon).where(Polygon.id == polygonId).values(updatedAt=datetime.utcnow())
+        )
+    
+    def touchPolygons(self, polygonIds: list[int]):
+        now = datetime.utcnow()
+        for chunk in _chunks(polygonIds):
+            self.session.execute(update(Polygon).where(Polygon.id.in_(chunk)).values(updatedAt=now))
+    
+    def logChange(self, polygonId: int, action: str):
+        if self.session.info.get("changeLog"):
+            self.session.add(PolygonChange(polygonId=polygonId, action=action))
+    
+    def logChanges(self, polygonIds: list[int], action: str):
+        if polygonIds and self.session.info.get("changeLog"):
+            now = datetime.utcnow()
+            self.session.execute(insert(PolygonChange), [
+                {"polygonId": polygonId, "action": action, "createdAt": now} for polygonId in polygonIds
+            ])
+    
+    @timedOperation
+    def getLastChangeId(self) -> int:
+        return self.session.execute(select(func.max(PolygonChange.id))).scalar() or 0
+    
+    @timedOperation
+    def getChanges(self, afterId: int, changeIds: Iterable[int] = (), limit: int = 1000) -> list:
+        condition = PolygonChange.id > afterId
+        changeIds = list(changeIds)
+        if changeIds:
+            condition = or_(condition, PolygonChange.id.in_(changeIds))
+        
+        return self.session.execute(
+            select(PolygonChange.id, PolygonChange.polygonId, PolygonChange.action)
+            .where(condition)
+            .order_by(PolygonChange.id)
+            .limit(limit)
+        ).all()
+    
+    @timedOperation
+    def pruneChanges(self, before: datetime) -> int:
+        result = self.session.execute(delete(PolygonChange).where(PolygonChange.createdAt < before))
+        self.session.commit()
+        return result.rowcount
+    
+    @timedOperation
+    def deletePolygon(self, polygonId: int, commit: bool = True) -> bool:
+        result = self.session.execute(
+            delete(Polygon).where(Polygon.id == polygonId).execution_options(synchronize_session=False)
+        )
+        if not result.rowcount:
+            return False
+        
+        self.logChange(polygonId, "delete")
+        if commit:
             self.session.commit()
-            return True
-        return False
+        return True
     
-    def updatePolygonFlags(self, polygonId: int, **kwargs) -> bool:
+    @timedOperation
+    def updatePolygonFlags(self, polygonId: int, commit: bool = True, **kwargs) -> bool:
         flags = self.session.query(PolygonFlags).filter(PolygonFlags.polygonId == polygonId).first()
         
         if not flags:
@@ -109,9 +302,35 @@ class PolygonRepository:
             if hasattr(flags, key):
                 setattr(flags, key, value)
         
-        self.session.commit()
+        self.touchPolygon(polygonId)
+        self.logChange(polygonId, "flags")
+        if commit:
+            self.session.commit()
         return True
     
+    @timedOperation
+    def updatePolygonsFlags(self, polygonIds: Iterable[int], commit: bool = True, **kwargs) -> list[int]:
+        values = {key: value for key, value in kwargs.items() if key in FLAG_COLUMNS}
+        polygonIds = list(dict.fromkeys(polygonIds))
+        if not values or not polygonIds:
+            return []
+        
+        updatedIds = []
+        for chunk in _chunks(polygonIds):
+            updatedIds.extend(self.session.execute(
+                select(PolygonFlags.polygonId).where(PolygonFlags.polygonId.in_(chunk))
+            ).scalars())
+            self.session.execute(
+                update(PolygonFlags).where(PolygonFlags.polygonId.in_(chunk)).values(**values)
+            )
+        
+        self.touchPolygons(updatedIds)
+        self.logChanges(updatedIds, "flags")
+        if commit:
+            self.session.commit()
+        return updatedIds
+    
+    @timedOperation
     def updatePolygonCoordinates(self, polygonId: int, 
                                  minX: float = None, minY: float = None, minZ: float = None,
                                  maxX: float = None, maxY: float = None, maxZ: float = None) -> bool:
@@ -133,10 +352,13 @@ class PolygonRepository:
         if maxZ is not None:
             coords.maxZ = maxZ
         
+        self.touchPolygon(polygonId)
+        self.logChange(polygonId, "coordinates")
         self.session.commit()
         return True
     
-    def addMember(self, polygonId: int, playerName: str) -> Optional[PolygonMember]:
+    @timedOperation
+    def addMember(self, polygonId: int, playerName: str, commit: bool = True) -> Optional[PolygonMember]:
         existing = self.session.query(PolygonMember).filter(
             PolygonMember.polygonId == polygonId,
             PolygonMember.playerName == playerName
@@ -151,10 +373,14 @@ class PolygonRepository:
         )
         
         self.session.add(member)
-        self.session.commit()
+        self.touchPolygon(polygonId)
+        self.logChange(polygonId, "addMember")
+        if commit:
+            self.session.commit()
         return member
     
-    def removeMember(self, polygonId: int, playerName: str) -> bool:
+    @timedOperation
+    def removeMember(self, polygonId: int, playerName: str, commit: bool = True) -> bool:
         member = self.session.query(PolygonMember).filter(
             PolygonMember.polygonId == polygonId,
             PolygonMember.playerName == playerName
@@ -162,9 +388,80 @@ class PolygonRepository:
         
         if member:
             self.session.delete(member)
-            self.session.commit()
+            self.touchPolygon(polygonId)
+            self.logChange(polygonId, "removeMember")
+            if commit:
+                self.session.commit()
             return True
         return False
     
+    def _memberPairs(self, polygonIds: list[int], playerNames: list[str]) -> set[tuple[int, str]]:
+        pairs = set()
+        for chunk in _chunks(polygonIds):
+            pairs.update(map(tuple, self.session.execute(
+                select(PolygonMember.polygonId, PolygonMember.playerName).where(
+                    PolygonMember.polygonId.in_(chunk),
+                    PolygonMember.playerName.in_(playerNames)
+                )
+            )))
+        return pairs
+    
+    @timedOperation
+    def addMembers(self, polygonIds: Iterable[int], playerNames: Iterable[str],
+                   commit: bool = True) -> list[tuple[int, str]]:
+        polygonIds = list(dict.fromkeys(polygonIds))
+        playerNames = list(dict.fromkeys(playerNames))
+        if not polygonIds or not playerNames:
+            return []
+        
+        existingIds = []
+        for chunk in _chunks(polygonIds):
+            existingIds.extend(self.session.execute(select(Polygon.id).where(Polygon.id.in_(chunk))).scalars())
+        
+        existing = self._memberPairs(existingIds, playerNames)
+        added = [(polygonId, playerName) for polygonId in existingIds for playerName in playerNames
+                 if (polygonId, playerName) not in existing]
+        if not added:
+            return []
+        
+        now = datetime.utcnow()
+        self.session.execute(insert(PolygonMember), [
+            {"polygonId": polygonId, "playerName": playerName, "addedAt": now}
+            for polygonId, playerName in added
+        ])
+        
+        changedIds = list(dict.fromkeys(polygonId for polygonId, _ in added))
+        self.touchPolygons(changedIds)
+        self.logChanges(changedIds, "addMember")
+        if commit:
+            self.session.commit()
+        return added
+    
+    @timedOperation
+    def removeMembers(self, polygonIds: Iterable[int], playerNames: Iterable[str],
+                      commit: bool = True) -> list[tuple[int, str]]:
+        polygonIds = list(dict.fromkeys(polygonIds))
+        playerNames = list(dict.fromkeys(playerNames))
+        if not polygonIds or not playerNames:
+            return []
+        
+        removed = sorted(self._memberPairs(polygonIds, playerNames))
+        if not removed:
+            return []
+        
+        for chunk in _chunks(polygonIds):
+            self.session.execute(delete(PolygonMember).where(
+                PolygonMember.polygonId.in_(chunk),
+                PolygonMember.playerName.in_(playerNames)
+            ))
+        
+        changedIds = list(dict.fromkeys(polygonId for polygonId, _ in removed))
+        self.touchPolygons(changedIds)
+        self.logChanges(changedIds, "removeMember")
+        if commit:
+            self.session.commit()
+        return removed
+    
+    @timedOperation
     def getPolygonMembers(self, polygonId: int) -> list[PolygonMember]:
         return self.session.query(PolygonMember).filter(PolygonMember.polygonId == polygonId).all()
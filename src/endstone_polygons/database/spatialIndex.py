@@ -0,0 +1,55 @@
+from sqlalchemy import Column, Float, Integer, MetaData, Table
+from sqlalchemy.engine import Connection
+
+
+SPATIAL_TABLE = "polygonSpatial"
+SPATIAL_TRIGGERS = ("polygonSpatialInsert", "polygonSpatialUpdate", "polygonSpatialDelete")
+
+polygonSpatial = Table(
+    SPATIAL_TABLE, MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("minX", Float), Column("maxX", Float),
+    Column("minY", Float), Column("maxY", Float),
+    Column("minZ", Float), Column("maxZ", Float)
+)
+
+_VALUES = "NEW.polygonId, NEW.minX, NEW.maxX, NEW.minY, NEW.maxY, NEW.minZ, NEW.maxZ"
+
+
+def createSpatialIndex(connection: Connection) -> bool:
+    connection.exec_driver_sql(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SPATIAL_TABLE} USING rtree(id, minX, maxX, minY, maxY, minZ, maxZ)"
+    )
+
+    insertTrigger, updateTrigger, deleteTrigger = SPATIAL_TRIGGERS
+    connection.exec_driver_sql(
+        f'CREATE TRIGGER IF NOT EXISTS {insertTrigger} AFTER INSERT ON "polygonCoordinates" BEGIN '
+        f"INSERT INTO {SPATIAL_TABLE} VALUES ({_VALUES}); END"
+    )
+    connection.exec_driver_sql(
+        f'CREATE TRIGGER IF NOT EXISTS {updateTrigger} AFTER UPDATE ON "polygonCoordinates" BEGIN '
+        f"DELETE FROM {SPATIAL_TABLE} WHERE id = OLD.polygonId; "
+        f"INSERT INTO {SPATIAL_TABLE} VALUES ({_VALUES}); END"
+    )
+    connection.exec_driver_sql(
+        f'CREATE TRIGGER IF NOT EXISTS {deleteTrigger} AFTER DELETE ON "polygonCoordinates" BEGIN '
+        f"DELETE FROM {SPATIAL_TABLE} WHERE id = OLD.polygonId; END"
+    )
+
+    indexed = connection.exec_driver_sql(f"SELECT count(*) FROM {SPATIAL_TABLE}").scalar()
+    expected = connection.exec_driver_sql('SELECT count(*) FROM "polygonCoordinates"').scalar()
+    if indexed == expected:
+        return False
+
+    connection.exec_driver_sql(f"DELETE FROM {SPATIAL_TABLE}")
+    connection.exec_driver_sql(
+        f'INSERT INTO {SPATIAL_TABLE} SELECT "polygonId", "minX", "maxX", "minY", "maxY", "minZ", "maxZ" '
+        f'FROM "polygonCoordinates"'
+    )
+    return True
+
+
+def dropSpatialIndex(connection: Connection):
+    for trigger in SPATIAL_TRIGGERS:
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS {SPATIAL_TABLE}")
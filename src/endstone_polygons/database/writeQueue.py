@@ -0,0 +1,136 @@
+import queue
+import threading
+
+from functools import partial
+
+from endstone.plugin import Plugin
+
+from .repository import PolygonRepository
+
+
+class WriteBehindQueue:
+    def __init__(self, plugin: Plugin, dbEngine, maxSize: int = 1000, batchSize: int = 100):
+        self._plugin = plugin
+        self._dbEngine = dbEngine
+        self._batchSize = batchSize
+
+        self._queue = queue.Queue(maxsize=maxSize)
+        self._pendingFlags: dict[int, dict] = {}
+        self._lock = threading.Lock()
+
+        self.queued = 0
+        self.written = 0
+
+        self._thread = threading.Thread(target=self._run, name="PolygonsWriteBehind", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        if not self._thread.is_alive():
+            return
+
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+        if self._thread.is_alive():
+            self._plugin.logger.warning(f"Write queue did not drain in {timeout}s, {self._queue.qsize()} writes left")
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def updatePolygonFlags(self, polygonId: int, **kwargs):
+        with self._lock:
+            pending = self._pendingFlags.get(polygonId)
+            if pending is not None:
+                pending.update(kwargs)
+                return
+
+            self._pendingFlags[polygonId] = dict(kwargs)
+
+        self._put(("updatePolygonFlags", (polygonId,), None))
+
+    def addMember(self, polygonId: int, playerName: str):
+        self._put(("addMember", (polygonId, playerName), {}))
+
+    def removeMember(self, polygonId: int, playerName: str):
+        self._put(("removeMember", (polygonId, playerName), {}))
+
+    def updatePolygonsFlags(self, polygonIds: list[int], **kwargs):
+        self._put(("updatePolygonsFlags", (tuple(polygonIds),), dict(kwargs)))
+
+    def addMembers(self, polygonIds: list[int], playerNames: list[str]):
+        self._put(("addMembers", (tuple(polygonIds), tuple(playerNames)), {}))
+
+    def removeMembers(self, polygonIds: list[int], playerNames: list[str]):
+        self._put(("removeMembers", (tuple(polygonIds), tuple(playerNames)), {}))
+
+    def deletePolygon(self, polygonId: int):
+        self._put(("deletePolygon", (polygonId,), {}))
+
+    def _put(self, operation: tuple):
+        if self._queue.full():
+            self._plugin.logger.warning("Write queue is full, waiting for the database")
+        self._queue.put(operation)
+        self.queued += 1
+
+    def _resolve(self, operation: tuple) -> tuple:
+        name, args, kwargs = operation
+        if kwargs is None:
+            with self._lock:
+                kwargs = self._pendingFlags.pop(args[0], {})
+        return name, args, kwargs
+
+    def _run(self):
+        running = True
+        while running:
+            operation = self._queue.get()
+            if operation is None:
+                break
+
+            batch = [self._resolve(operation)]
+            while len(batch) < self._batchSize:
+                try:
+                    operation = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if operation is None:
+                    running = False
+                    break
+
+                batch.append(self._resolve(operation))
+
+            self._writeBatch(batch)
+            self.written += len(batch)
+
+    def _writeBatch(self, batch: list[tuple]):
+        session = self._dbEngine.getSession()
+        repository = PolygonRepository(session)
+
+        try:
+            try:
+                for name, args, kwargs in batch:
+                    getattr(repository, name)(*args, commit=False, **kwargs)
+                session.commit()
+                return
+
+            except Exception:
+                session.rollback()
+
+            for name, args, kwargs in batch:
+                try:
+                    getattr(repository, name)(*args, **kwargs)
+                except Exception as error:
+                    session.rollback()
+                    self._reportFailure(name, args, error)
+
+        finally:
+            session.close()
+
+    def _reportFailure(self, name: str, args: tuple, error: Exception):
+        self._plugin.server.scheduler.run_task(self._plugin, partial(self._logFailure, name, args, error))
+
+    def _logFailure(self, name: str, args: tuple, error: Exception):
+        self._plugin.logger.error(f"Failed to write {name}{args} to the database: {error}")
@@ -1,6 +1,7 @@
 from endstone_polygons.forms.create import CreatePolygonForm
 from endstone_polygons.forms.menu import MenuPolygonForm
 from endstone_polygons.forms.info import InfoPolygonForm
+from endstone_polygons.forms.nearby import NearbyPolygonsForm
 from endstone_polygons.forms.control import ControlPolygonForm
 from endstone_polygons.forms.flags import FlagsPolygonForm
 from endstone_polygons.forms.addMember import AddMemberForm
@@ -12,6 +13,7 @@ __all__ = [
     "CreatePolygonForm",
     "MenuPolygonForm",
     "InfoPolygonForm",
+    "NearbyPolygonsForm",
     "ControlPolygonForm",
     "FlagsPolygonForm",
     "AddMemberForm",
@@ -1,13 +1,13 @@
+import json
+
 from .base import BasePolygonForm
 
 from endstone import Player
 
-from endstone.form import ActionForm, Button, Divider
+from endstone.form import ActionForm, ModalForm, Button, Divider, TextInput
 
-from ..cache import PolygonCache
-from ..database.models import Polygon
+from ..cache import PolygonCache, PolygonRecord
 from ..database.engine import DatabaseEngine
-from ..database.repository import PolygonRepository
 
 
 class AddMemberForm(BasePolygonForm):
@@ -17,7 +17,9 @@ class AddMemberForm(BasePolygonForm):
             dbEngine: DatabaseEngine,
             config: dict,
             player: Player,
-            polygon: Polygon
+            polygon: PolygonRecord,
+            query: str = "",
+            page: int = 0
         ):
         super().__init__(config)
         
@@ -25,26 +27,35 @@ class AddMemberForm(BasePolygonForm):
         self._dbEngine = dbEngine
         self._player = player
         self._polygon = polygon
+        self._query = query
+        self._page = page
+        
+        self._actions: list[tuple] = []
     
-    def _onSubmit(self, player: Player, buttonIndex: int) -> None:
-        onlinePlayers = [p for p in player.server.online_players 
-                        if p.name != self._polygon.owner 
-                        and not self._cache.isMember(self._polygon.id, p.name)]
-        
-        if buttonIndex != 0:
-            selectedPlayer = onlinePlayers[buttonIndex - 1]
-            playerName = selectedPlayer.name
-            
-            with self._dbEngine as session:
-                repo = PolygonRepository(session)
-                repo.addMember(self._polygon.id, playerName)
-            
-            self._cache.addMember(self._polygon.id, playerName)
+    def _reopen(self, player: Player, query: str, page: int) -> None:
+        player.send_form(AddMemberForm(self._cache, self._dbEngine, self._config, self._player, self._polygon, query, page).buildForm())
+    
+    def _onSubmit(self, player: Player, data: str) -> None:
+        action, value = self._actions[int(data)]
+        
+        if action == "search":
+            player.play_sound(player.location, "random.pop")
+            player.send_form(self._buildSearchForm())
+            return
+        
+        if action == "page":
+            player.play_sound(player.location, "random.pop")
+            self._reopen(player, self._query, value)
+            return
+        
+        if action == "player" and not self._cache.isMember(self._polygon.id, value):
+            self._cache.addMember(self._polygon.id, value)
+            self._dbEngine.writeQueue.addMember(self._polygon.id, value)
             
             player.play_sound(player.location, "note.pling")
             player.send_toast(
                 self._messages.get("title"),
-                self._messages.get("memberAdded").format(player=playerName, name=self._polygon.name)
+                self._messages.get("memberAdded").format(player=value, name=self._polygon.name)
             )
         
         else:
@@ -53,28 +64,75 @@ class AddMemberForm(BasePolygonForm):
         from .control import ControlPolygonForm
         player.send_form(ControlPolygonForm(self._cache, self._dbEngine, self._config, self._player, self._polygon).buildForm())
 
+    def _onSearch(self, player: Player, data: str) -> None:
+        formData: list = json.loads(data)
+        player.play_sound(player.location, "random.pop")
+        self._reopen(player, (formData[0] or "").strip(), 0)
+
+    def _onSearchClose(self, player: Player) -> None:
+        player.play_sound(player.location, "random.pop")
+        self._reopen(player, self._query, self._page)
+
     def _onClose(self, player: Player) -> None:
         player.play_sound(player.location, "random.pop")
 
+    def _buildSearchForm(self) -> ModalForm:
+        textForm: dict = self._textForms.get("addMember")
+        
+        return ModalForm(
+            title=textForm.get("searchTitle", "Search players"),
+            controls=[
+                TextInput(textForm.get("searchInput", "Player name"), textForm.get("searchPlaceholder", ""), self._query)
+            ],
+            on_submit=self._onSearch,
+            on_close=self._onSearchClose
+        )
+
     def buildForm(self) -> ActionForm:
-        onlinePlayers = [p for p in self._player.server.online_players 
-                        if p.name != self._polygon.owner 
-                        and not self._cache.isMember(self._polygon.id, p.name)]
-    
-        content = self._textForms.get("addMember").get("content") if onlinePlayers else self._textForms.get("addMember").get("contentEmpty")
+        textForm: dict = self._textForms.get("addMember")
+        
+        members = self._polygon.members
+        candidates = [name for name in self._cache.onlinePlayers.search(self._query)
+                      if name != self._polygon.owner and name not in members]
+        
+        pageSize = max(1, textForm.get("pageSize", 20))
+        pages = max(1, -(-len(candidates) // pageSize))
+        self._page = min(max(self._page, 0), pages - 1)
+        
+        if not candidates:
+            content = textForm.get("contentEmpty")
+        elif self._query:
+            content = textForm.get("contentSearch", textForm.get("content")).format(query=self._query)
+        else:
+            content = textForm.get("content")
+        
+        if pages > 1:
+            content += "\n" + textForm.get("page", "Page {page} of {pages}").format(page=self._page + 1, pages=pages)
         
-        form = ActionForm(
-            title=self._textForms.get("addMember").get("title").format(name=self._polygon.name),
+        self._actions = [("back", None), ("search", None)]
+        buttons = [
+            Button(textForm.get("buttonBack")),
+            Button(textForm.get("buttonSearch", "Search players")),
+            Divider()
+        ]
+        
+        start = self._page * pageSize
+        for name in candidates[start:start + pageSize]:
+            self._actions.append(("player", name))
+            buttons.append(Button(name))
+        
+        if self._page > 0:
+            self._actions.append(("page", self._page - 1))
+            buttons.append(Button(textForm.get("buttonPrevious", "Previous page")))
+        
+        if self._page < pages - 1:
+            self._actions.append(("page", self._page + 1))
+            buttons.append(Button(textForm.get("buttonNext", "Next page")))
+        
+        return ActionForm(
+            title=textForm.get("title").format(name=self._polygon.name),
             content=content,
-            buttons=[
-                Button(self._textForms.get("addMember").get("buttonBack")),
-                Divider()
-            ],
+            buttons=buttons,
             on_submit=self._onSubmit,
             on_close=self._onClose
         )
-        
-        for onlinePlayer in onlinePlayers:
-            form.add_button(onlinePlayer.name)
-        
-        return form
@@ -3,8 +3,7 @@ from .base import BasePolygonForm
 from endstone import Player
 from endstone.form import ActionForm, Divider, Button
 
-from ..cache import PolygonCache
-from ..database.models import Polygon
+from ..cache import PolygonCache, PolygonRecord
 from ..database.engine import DatabaseEngine
 
 
@@ -15,7 +14,7 @@ class ControlPolygonForm(BasePolygonForm):
             dbEngine: DatabaseEngine,
             config: dict,
             player: Player,
-            polygon: Polygon
+            polygon: PolygonRecord
         ):
         super().__init__(config)
         
@@ -53,15 +52,14 @@ class ControlPolygonForm(BasePolygonForm):
         player.play_sound(player.location, "random.pop")
 
     def buildForm(self) -> ActionForm:
-        flags = self._polygon.flags
-        members_count = len(self._polygon.members) if self._polygon.members else 0
+        members_count = len(self._polygon.members)
         
         membersList = ""
-        if self._polygon.members and members_count > 0:
+        if members_count > 0:
             membersList = "\nMembers:\n"
 
-            for member in self._polygon.members:
-                membersList += f"  • {member.playerName}\n"
+            for member in sorted(self._polygon.members):
+                membersList += f"  • {member}\n"
 
             membersList += "\n"
         
@@ -71,9 +69,10 @@ class ControlPolygonForm(BasePolygonForm):
             world=self._polygon.world,
             membersCount=members_count,
             members_list=membersList,
-            canBreak="Yes" if flags and flags.canBreak else "No",
-            canPlace="Yes" if flags and flags.canPlace else "No",
-            canOpenChests="Yes" if flags and flags.canOpenChests else "No"
+            canBreak="Yes" if self._polygon.canBreak else "No",
+            canPlace="Yes" if self._polygon.canPlace else "No",
+            canOpenChests="Yes" if self._polygon.canOpenChests else "No",
+            allowExplosions="Yes" if self._polygon.allowExplosions else "No"
         )
 
         return ActionForm(
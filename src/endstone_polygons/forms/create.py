@@ -8,6 +8,8 @@ from endstone.level import Location
 
 from endstone.form import ModalForm, TextInput, Label
 
+from sqlalchemy.exc import IntegrityError
+
 from ..cache import PolygonCache
 from ..database.engine import DatabaseEngine
 from ..database.repository import PolygonRepository
@@ -51,27 +53,26 @@ class CreatePolygonForm(BasePolygonForm):
         
         world = self._location.dimension.name
 
+        if self._cache.isNameTaken(polygonName):
+            self._rejectName(player, polygonName)
+            return
+
         with self._dbEngine as session:
             repo = PolygonRepository(session)
-            existing = repo.getPolygonByName(polygonName)
-
-            if existing:
-                player.send_toast(
-                    self._messages.get("title"),
-                    self._messages.get("existName").format(name=polygonName)
+            
+            try:
+                polygon = repo.createPolygon(
+                    name=polygonName, owner=player.name, world=world,
+                    centerX=blockX, centerY=blockY, centerZ=blockZ,
+                    minX=minX, minY=minY, minZ=minZ, 
+                    maxX=maxX, maxY=maxY, maxZ=maxZ
                 )
-                player.send_form(self.buildForm())
-                player.play_sound(player.location, "random.pop")
+            except IntegrityError:
+                session.rollback()
+                self._rejectName(player, polygonName)
                 return
-                        
-            polygon = repo.createPolygon(
-                name=polygonName, owner=player.name, world=world,
-                centerX=blockX, centerY=blockY, centerZ=blockZ,
-                minX=minX, minY=minY, minZ=minZ, 
-                maxX=maxX, maxY=maxY, maxZ=maxZ
-            )
             
-            self._cache.addPolygon(polygon, session)
+            record = self._cache.addPolygon(polygon)
         
         player.play_sound(player.location, "block.end_portal.spawn")
         player.send_toast(
@@ -80,36 +81,15 @@ class CreatePolygonForm(BasePolygonForm):
         )
                 
         if self._config.get("visualBorder"):
-            maxX, maxY, maxZ = maxX + 1, maxY + 1, maxZ + 1
-
-            def visualBorder():
-                for x in range(minX, maxX):
-                    player.spawn_particle("ll:pointP1", x, minY, minZ)
-                    player.spawn_particle("ll:pointP1", x, minY, maxZ)
-                for z in range(minZ, maxZ):
-                    player.spawn_particle("ll:pointP1", minX, minY, z)
-                    player.spawn_particle("ll:pointP1", maxX, minY, z)
-                
-                for x in range(minX, maxX):
-                    player.spawn_particle("ll:pointP1", x, maxY, minZ)
-                    player.spawn_particle("ll:pointP1", x, maxY, maxZ)
-                for z in range(minZ, maxZ):
-                    player.spawn_particle("ll:pointP1", minX, maxY, z)
-                    player.spawn_particle("ll:pointP1", maxX, maxY, z)
-                
-                for y in range(minY, maxY):
-                    player.spawn_particle("ll:pointP1", minX, y, minZ)
-                    player.spawn_particle("ll:pointP1", maxX, y, minZ)
-                    player.spawn_particle("ll:pointP1", minX, y, maxZ)
-                    player.spawn_particle("ll:pointP1", maxX, y, maxZ)
-
-            try:
-                visualBorder()
-                for i in range(1, 11):
-                    self._plugin.server.scheduler.run_task(self._plugin, visualBorder, delay=i * 40)
-                
-            except:
-                return
+            self._plugin._borderRenderer.show(player, record)
+            
+    def _rejectName(self, player: Player, polygonName: str) -> None:
+        player.send_toast(
+            self._messages.get("title"),
+            self._messages.get("existName").format(name=polygonName)
+        )
+        player.send_form(self.buildForm())
+        player.play_sound(player.location, "random.pop")
             
     def _onClose(self, player: Player) -> None:
         player.play_sound(player.location, "random.anvil_break")
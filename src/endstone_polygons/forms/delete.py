@@ -6,10 +6,8 @@ from endstone import Player
 
 from endstone.form import ModalForm, Label, Toggle
 
-from ..cache import PolygonCache
-from ..database.models import Polygon
+from ..cache import PolygonCache, PolygonRecord
 from ..database.engine import DatabaseEngine
-from ..database.repository import PolygonRepository
 
 
 class DeletePolygonForm(BasePolygonForm):
@@ -19,7 +17,7 @@ class DeletePolygonForm(BasePolygonForm):
             dbEngine: DatabaseEngine,
             config: dict,
             player: Player,
-            polygon: Polygon
+            polygon: PolygonRecord
         ):
         super().__init__(config)
         
@@ -43,10 +41,7 @@ class DeletePolygonForm(BasePolygonForm):
 
             return
         
-        with self._dbEngine as session:
-            repo = PolygonRepository(session)
-            repo.deletePolygon(self._polygon.id)
-        
+        self._dbEngine.writeQueue.deletePolygon(self._polygon.id)
         self._cache.removePolygon(self._polygon.id)
         
         player.play_sound(player.location, "note.bass")
@@ -64,7 +59,7 @@ class DeletePolygonForm(BasePolygonForm):
         player.play_sound(player.location, "random.pop")
 
     def buildForm(self) -> ModalForm:
-        members_count = len(self._polygon.members) if self._polygon.members else 0
+        members_count = len(self._polygon.members)
         
         warning = self._textForms.get("delete").get("warning").format(
             name=self._polygon.name,
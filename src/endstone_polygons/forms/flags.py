@@ -6,10 +6,8 @@ from endstone import Player
 
 from endstone.form import ModalForm, Toggle, Label
 
-from ..cache import PolygonCache
-from ..database.models import Polygon
+from ..cache import PolygonCache, PolygonRecord
 from ..database.engine import DatabaseEngine
-from ..database.repository import PolygonRepository
 
 
 class FlagsPolygonForm(BasePolygonForm):
@@ -19,7 +17,7 @@ class FlagsPolygonForm(BasePolygonForm):
             dbEngine: DatabaseEngine,
             config: dict,
             player: Player,
-            polygon: Polygon
+            polygon: PolygonRecord
         ):
         super().__init__(config)
         
@@ -34,21 +32,21 @@ class FlagsPolygonForm(BasePolygonForm):
         canBreak = formData[1]
         canPlace = formData[2]
         canOpenChests = formData[3]
+        allowExplosions = formData[4]
         
-        with self._dbEngine as session:
-            repo = PolygonRepository(session)
-            repo.updatePolygonFlags(
-                self._polygon.id,
-                canBreak=canBreak,
-                canPlace=canPlace,
-                canOpenChests=canOpenChests
-            )
-
         self._cache.updatePolygonFlags(
             self._polygon.id,
             canBreak=canBreak,
             canPlace=canPlace,
-            canOpenChests=canOpenChests
+            canOpenChests=canOpenChests,
+            allowExplosions=allowExplosions
+        )
+        self._dbEngine.writeQueue.updatePolygonFlags(
+            self._polygon.id,
+            canBreak=canBreak,
+            canPlace=canPlace,
+            canOpenChests=canOpenChests,
+            allowExplosions=allowExplosions
         )
         
         player.play_sound(player.location, "block.enchanting_table.use")
@@ -66,15 +64,14 @@ class FlagsPolygonForm(BasePolygonForm):
         player.play_sound(player.location, "random.pop")
 
     def buildForm(self) -> ModalForm:
-        flags = self._polygon.flags
-        
         return ModalForm(
             title=self._textForms.get("flags").get("title").format(name=self._polygon.name),
             controls=[
                 Label(self._textForms.get("flags").get("label").format(name=self._polygon.name)),
-                Toggle(self._textForms.get("flags").get("toggleBreak"), flags.canBreak if flags else False),
-                Toggle(self._textForms.get("flags").get("togglePlace"), flags.canPlace if flags else False),
-                Toggle(self._textForms.get("flags").get("toggleChests"), flags.canOpenChests if flags else False)
+                Toggle(self._textForms.get("flags").get("toggleBreak"), self._polygon.canBreak),
+                Toggle(self._textForms.get("flags").get("togglePlace"), self._polygon.canPlace),
+                Toggle(self._textForms.get("flags").get("toggleChests"), self._polygon.canOpenChests),
+                Toggle(self._textForms.get("flags").get("toggleExplosions", "Allow explosions"), self._polygon.allowExplosions)
             ],
             on_submit=self._onSubmit,
             on_close=self._onClose
@@ -13,26 +13,40 @@ class MenuPolygonForm(BasePolygonForm):
             cache: PolygonCache,
             dbEngine: DatabaseEngine,
             config: dict,
-            player: Player
+            player: Player,
+            page: int = 0
         ):
         super().__init__(config)
         
         self._cache = cache
         self._dbEngine = dbEngine
         self._player = player
+        self._page = page
         
-        self._polygons = self._cache.getPolygonsByOwner(player.name)
+        self._actions: list[tuple] = []
     
     def _onSubmit(self, player: Player, data: str) -> None:
-        formData = int(data)
+        action, value = self._actions[int(data)]
         player.play_sound(player.location, "random.pop")
         
-        if formData == 0:
+        if action == "info":
             from .info import InfoPolygonForm
             player.send_form(InfoPolygonForm(self._cache, self._dbEngine, self._config, self._player).buildForm())
             return
         
-        selectedPolygon = self._polygons[formData - 1]
+        if action == "nearby":
+            from .nearby import NearbyPolygonsForm
+            player.send_form(NearbyPolygonsForm(self._cache, self._dbEngine, self._config, self._player).buildForm())
+            return
+        
+        if action == "page":
+            player.send_form(MenuPolygonForm(self._cache, self._dbEngine, self._config, self._player, value).buildForm())
+            return
+        
+        selectedPolygon = self._cache.polygons.get(value)
+        if selectedPolygon is None or selectedPolygon.owner != player.name:
+            player.send_form(MenuPolygonForm(self._cache, self._dbEngine, self._config, self._player, self._page).buildForm())
+            return
             
         from .control import ControlPolygonForm
         player.send_form(ControlPolygonForm(self._cache, self._dbEngine, self._config, self._player, selectedPolygon).buildForm())
@@ -41,18 +55,44 @@ class MenuPolygonForm(BasePolygonForm):
         player.play_sound(player.location, "random.pop")
 
     def buildForm(self) -> ActionForm:
-        buttons = [Button(self._textForms.get("menu").get("buttonInfo"))]
+        textForm: dict = self._textForms.get("menu")
         
-        if self._polygons:
+        polygonIds = self._cache.getPolygonIdsByOwner(self._player.name)
+        pageSize = max(1, textForm.get("pageSize", 20))
+        pages = max(1, -(-len(polygonIds) // pageSize))
+        self._page = min(max(self._page, 0), pages - 1)
+        
+        self._actions = [("info", None), ("nearby", None)]
+        buttons = [
+            Button(textForm.get("buttonInfo")),
+            Button(textForm.get("buttonNearby", "Nearby polygons"))
+        ]
+        
+        if polygonIds:
             buttons.append(Divider())
         
-        for polygon in self._polygons:
+        start = self._page * pageSize
+        for polygonId in polygonIds[start:start + pageSize]:
+            polygon = self._cache.polygons[polygonId]
+            self._actions.append(("polygon", polygon.id))
             buttons.append(Button(polygon.name))
         
+        if self._page > 0:
+            self._actions.append(("page", self._page - 1))
+            buttons.append(Button(textForm.get("buttonPrevious", "Previous page")))
+        
+        if self._page < pages - 1:
+            self._actions.append(("page", self._page + 1))
+            buttons.append(Button(textForm.get("buttonNext", "Next page")))
+        
+        content = textForm.get("content").format(count=len(polygonIds))
+        if pages > 1:
+            content += "\n" + textForm.get("page", "Page {page} of {pages}").format(page=self._page + 1, pages=pages)
+        
         return ActionForm(
             title=self._title,
-            content=self._textForms.get("menu").get("content").format(count=len(self._polygons)),
+            content=content,
             buttons=buttons,
             on_submit=self._onSubmit,
             on_close=self._onClose
-        )
\ No newline at end of file
+        )
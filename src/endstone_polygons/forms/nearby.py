@@ -0,0 +1,70 @@
+from math import atan2, degrees
+
+from .base import BasePolygonForm
+
+from endstone import Player
+from endstone.form import ActionForm, Button
+
+from ..cache import PolygonCache
+from ..database.engine import DatabaseEngine
+
+
+DIRECTIONS = ("N", "NE", "E", "SE", "S", "SW", "W", "NW")
+
+
+class NearbyPolygonsForm(BasePolygonForm):
+    def __init__(
+            self,
+            cache: PolygonCache,
+            dbEngine: DatabaseEngine,
+            config: dict,
+            player: Player
+        ):
+        super().__init__(config)
+
+        self._cache = cache
+        self._dbEngine = dbEngine
+        self._player = player
+
+    def _direction(self, x: float, z: float) -> str:
+        location = self._player.location
+        angle = degrees(atan2(x - location.x, location.z - z)) % 360
+        return DIRECTIONS[int((angle + 22.5) // 45) % 8]
+
+    def _onSubmit(self, player: Player, data: str) -> None:
+        from .menu import MenuPolygonForm
+
+        player.play_sound(player.location, "random.pop")
+        player.send_form(MenuPolygonForm(self._cache, self._dbEngine, self._config, self._player).buildForm())
+
+    def _onClose(self, player: Player) -> None:
+        player.play_sound(player.location, "random.pop")
+
+    def buildForm(self) -> ActionForm:
+        textForm: dict = self._textForms.get("nearby", {})
+        location = self._player.location
+
+        nearest = self._cache.findNearestPolygons(
+            location.dimension.name, location.x, location.z, textForm.get("count", 10)
+        )
+
+        if nearest:
+            lines = [textForm.get("content", "Polygons closest to you:")]
+            for polygon, distance in nearest:
+                lines.append(textForm.get("entry", "• {name} ({owner}) - {distance} blocks {direction}").format(
+                    name=polygon.name,
+                    owner=polygon.owner,
+                    distance=round(distance),
+                    direction=self._direction(polygon.centerX, polygon.centerZ)
+                ))
+            content = "\n".join(lines)
+        else:
+            content = textForm.get("contentEmpty", "There are no polygons in this world")
+
+        return ActionForm(
+            title=textForm.get("title", "Nearby polygons"),
+            content=content,
+            buttons=[Button(textForm.get("buttonBack", "Back"))],
+            on_submit=self._onSubmit,
+            on_close=self._onClose
+        )
@@ -4,10 +4,8 @@ from endstone import Player
 
 from endstone.form import ActionForm, Button, Divider
 
-from ..cache import PolygonCache
-from ..database.models import Polygon
+from ..cache import PolygonCache, PolygonRecord
 from ..database.engine import DatabaseEngine
-from ..database.repository import PolygonRepository
 
 
 class RemoveMemberForm(BasePolygonForm):
@@ -17,7 +15,7 @@ class RemoveMemberForm(BasePolygonForm):
             dbEngine: DatabaseEngine,
             config: dict,
             player: Player,
-            polygon: Polygon
+            polygon: PolygonRecord
         ):
         super().__init__(config)
         
@@ -25,20 +23,16 @@ class RemoveMemberForm(BasePolygonForm):
         self._dbEngine = dbEngine
         self._player = player
         self._polygon = polygon
-        self._members = list(polygon.members) if polygon.members else []
+        self._members = sorted(polygon.members)
     
     def _onSubmit(self, player: Player, data: str) -> None:
         memberIndex = int(data)
         
         if memberIndex != 0:
-            member = self._members[memberIndex - 1]
-            playerName = member.playerName
-            
-            with self._dbEngine as session:
-                repo = PolygonRepository(session)
-                repo.removeMember(self._polygon.id, playerName)
+            playerName = self._members[memberIndex - 1]
             
             self._cache.removeMember(self._polygon.id, playerName)
+            self._dbEngine.writeQueue.removeMember(self._polygon.id, playerName)
 
             player.play_sound(player.location, "random.pop")
             player.send_toast(
@@ -70,6 +64,6 @@ class RemoveMemberForm(BasePolygonForm):
         )
         
         for member in self._members:
-            form.add_button(member.playerName)
+            form.add_button(member)
         
         return form
\ No newline at end of file
@@ -1,14 +1,25 @@
+from datetime import datetime, timedelta
+
 from endstone.plugin import Plugin
 
+from endstone.block import BlockFace
 from endstone.event import (
+    ActorExplodeEvent,
     BlockPlaceEvent,
     BlockBreakEvent,
+    BlockPistonEvent,
+    BlockPistonExtendEvent,
+    BlockPistonRetractEvent,
     EventPriority,
     PlayerInteractEvent,
+    PlayerJoinEvent,
+    PlayerQuitEvent,
     event_handler
 )
 
-from .cache import PolygonCache
+from .cache import PolygonCache, CacheSnapshot, ChangePoller, TileCache
+from .metrics import Metrics
+from .visual import BorderRenderer
 
 from .database.engine import DatabaseEngine
 from .database.repository import PolygonRepository
@@ -21,6 +32,18 @@ from .tools import Command, CommandBuilder, Permission
 from .containers import CONTAINERS
 
 
+PISTON_OFFSETS = {
+    BlockFace.DOWN: (0, -1, 0),
+    BlockFace.UP: (0, 1, 0),
+    BlockFace.NORTH: (0, 0, -1),
+    BlockFace.SOUTH: (0, 0, 1),
+    BlockFace.WEST: (-1, 0, 0),
+    BlockFace.EAST: (1, 0, 0)
+}
+
+PISTON_PUSH_LIMIT = 12
+
+
 class Polygons(Plugin):
     api_version = "0.10"
 
@@ -30,7 +53,7 @@ class Polygons(Plugin):
         Command(
             name="polygon",
             description="Polygon management",
-            usages="/polygon",
+            usages=["/polygon", "/polygon (stats|borders)<action: PolygonAction>"],
             aliases="pg",
             permissions=Permission(
                 name="polygon.command.polygon",
@@ -40,6 +63,14 @@ class Polygons(Plugin):
         )
     )
 
+    commandBuilder.addPermission(
+        Permission(
+            name="polygon.command.stats",
+            description="Permission to view polygon performance statistics",
+            default="op"
+        )
+    )
+
     commands = commandBuilder.commands
     permissions = commandBuilder.permissions
 
@@ -48,14 +79,21 @@ class Polygons(Plugin):
 
     def on_enable(self) -> None:
         self.save_default_config()
-        self.register_events(self)
         
         self._messages: dict = self.config.get("messages")
         self._polygonTypes: dict = self.config.get("polygonTypes")
         
         dbPath = str(self.data_folder / "polygons.db")
         self._dbEngine = DatabaseEngine(self.config, dbPath)
-        self._dbEngine.createTables()
+        for version, description in self._dbEngine.createTables():
+            self.logger.info(f"Applied database migration {version}: {description}")
+        
+        writeQueueConfig: dict = self.config.get("database").get("writeQueue", {})
+        self._dbEngine.startWriteQueue(
+            self,
+            maxSize=writeQueueConfig.get("maxSize", 1000),
+            batchSize=writeQueueConfig.get("batchSize", 100)
+        )
         
         dbType = self.config.get("database").get("type")
         if dbType == "sqlite":
@@ -63,22 +101,115 @@ class Polygons(Plugin):
         else:
             self.logger.info(f"Database initialized ({dbType.upper()})")
         
-        self._cache = PolygonCache(self.logger)
+        self.logger.info(f"Database pool: {self._dbEngine.getPoolStatus()}")
+        if self.config.get("database").get("sqlite", {}).get("spatialIndex", False) and dbType == "sqlite":
+            if self._dbEngine.spatialIndex:
+                self.logger.info("SQLite R*Tree spatial index enabled")
+            else:
+                self.logger.warning("SQLite was built without the R*Tree module, database position lookups use range scans")
+        if self._dbEngine.pragmas:
+            pragmas = ", ".join(f"{name}={value}" for name, value in self._dbEngine.getPragmas().items())
+            self.logger.info(f"SQLite pragmas: {pragmas}")
+        
+        self._cache = PolygonCache(self.logger, self.config)
+        for player in self.server.online_players:
+            self._cache.onlinePlayers.add(player.name)
+        self._snapshot = None
+        
+        lazyConfig: dict = self.config.get("cache", {}).get("lazy", {})
+        snapshotConfig: dict = self.config.get("cache", {}).get("snapshot", {})
+        if snapshotConfig.get("enabled", False) and not lazyConfig.get("enabled", False):
+            self._snapshot = CacheSnapshot(self.data_folder / "snapshot", self.logger)
+        
+        syncConfig: dict = self.config.get("database").get("sync", {})
+        if syncConfig.get("enabled", False):
+            self._dbEngine.enableChangeLog()
         
         session = self._dbEngine.getSession()
         repository = PolygonRepository(session)
+        repository.pruneChanges(datetime.utcnow() - timedelta(seconds=syncConfig.get("retention", 3600)))
+        lastChangeId = repository.getLastChangeId()
 
-        self._cache.loadFromDatabase(repository)
+        if lazyConfig.get("enabled", False):
+            self._cache.tiles = TileCache(self, self._dbEngine, self._cache, self.config)
+            self._cache.tiles.start()
+            self._cache.loaded = True
+            self.logger.info(
+                f"Loading polygons lazily in {self._cache.tiles.tileSize}-block tiles, "
+                f"up to {self._cache.tiles.memoryBudget} MiB in memory"
+            )
+        elif not (self._snapshot and self._snapshot.load(self._cache, repository)):
+            self._cache.loadFromDatabase(repository)
         session.close()
+        
+        snapshotInterval = snapshotConfig.get("interval", 600)
+        if self._snapshot and snapshotInterval > 0:
+            self.server.scheduler.run_task(
+                self, self._saveSnapshot, delay=snapshotInterval * 20, period=snapshotInterval * 20
+            )
+
+        self._changePoller = None
+        if syncConfig.get("enabled", False):
+            self._changePoller = ChangePoller(
+                self, self._dbEngine, self._cache,
+                interval=syncConfig.get("interval", 5),
+                retention=syncConfig.get("retention", 3600)
+            )
+            self._changePoller.start(lastChangeId)
 
+        self._borderRenderer = BorderRenderer(self, self.config)
+        self._borderRenderer.start()
+        
+        self._metrics = None
+        metricsConfig: dict = self.config.get("metrics", {})
+        if metricsConfig.get("enabled", False):
+            self._metrics = Metrics()
+            self._cache.metrics = self._metrics
+            self._dbEngine.enableMetrics(self._metrics)
+            
+            for name in ("placeBlock", "breakBlock", "openContainers", "explodeActor", "extendPiston", "retractPiston"):
+                setattr(self, name, self._metrics.timeHandler(name, getattr(self, name)))
+            
+            logInterval = metricsConfig.get("logInterval", 300)
+            if logInterval > 0:
+                self.server.scheduler.run_task(
+                    self, self._logMetrics, delay=logInterval * 20, period=logInterval * 20
+                )
+        
+        self.register_events(self)
         self.get_command("polygon").executor = PolygonCommand(self)
 
     def on_disable(self) -> None:
-        if hasattr(self, 'dbEngine'):
+        if getattr(self, '_borderRenderer', None):
+            self._borderRenderer.stop()
+        
+        if getattr(self, '_changePoller', None):
+            self._changePoller.stop()
+        
+        if getattr(self, '_cache', None) and self._cache.tiles:
+            self._cache.tiles.stop()
+        
+        if hasattr(self, '_dbEngine'):
+            if self._dbEngine.writeQueue:
+                self._dbEngine.writeQueue.stop()
+            
+            if getattr(self, '_snapshot', None):
+                self._snapshot.write(self._cache, self._dbEngine)
+            
             self._dbEngine.close()
+        
+        if hasattr(self, '_cache'):
+            self._cache.close()
 
         self.logger.info("Polygons disabled")
     
+    def _saveSnapshot(self) -> None:
+        self._snapshot.write(self._cache, self._dbEngine, background=True)
+    
+    def _logMetrics(self) -> None:
+        for line in self._metrics.summary():
+            self.logger.info(line)
+    
     @event_handler(priority=EventPriority.HIGHEST)
     def placeBlock(self, event: BlockPlaceEvent):
         player = event.player
@@ -86,7 +217,7 @@ class Polygons(Plugin):
         location = block.location
         
         if block.type in self._polygonTypes.keys():
-            existingPolygon = self._cache.findPolygonAtPosition(location.dimension.name, location.x, location.z, location.y)
+            existingPolygon = self._cache.findPolygonForPlayer(player.name, location.dimension.name, location.x, location.z, location.y)
             if existingPolygon:
                 if not self._cache.canPlace(existingPolygon, player.name):
                     event.is_cancelled = True
@@ -113,7 +244,7 @@ class Polygons(Plugin):
                 
                 return
         
-        polygon = self._cache.findPolygonAtPosition(location.dimension.name, location.x, location.z, location.y)
+        polygon = self._cache.findPolygonForPlayer(player.name, location.dimension.name, location.x, location.z, location.y)
         if polygon:
             if not self._cache.canPlace(polygon, player.name):
                 event.is_cancelled = True
@@ -126,24 +257,19 @@ class Polygons(Plugin):
         player = event.player
         location = block.location
         
-        polygon = self._cache.findPolygonAtPosition(location.dimension.name, location.x, location.z, location.y)
+        polygon = self._cache.findPolygonForPlayer(player.name, location.dimension.name, location.x, location.z, location.y)
         if polygon:
-            if (polygon.coordinates and
-                block.type in self._polygonTypes.keys() and
-                int(location.x) == polygon.coordinates.centerX and
-                int(location.y) == polygon.coordinates.centerY and
-                int(location.z) == polygon.coordinates.centerZ):
+            if (block.type in self._polygonTypes.keys() and
+                int(location.x) == polygon.centerX and
+                int(location.y) == polygon.centerY and
+                int(location.z) == polygon.centerZ):
                 
                 if not self._cache.isOwner(polygon.id, player.name):
                     event.is_cancelled = True
                     player.send_popup(self._messages.get("onlyOwnerCanDelete").format(name=polygon.name))
                     return
                 
-                session = self._dbEngine.getSession()
-                repository = PolygonRepository(session)
-                repository.deletePolygon(polygon.id)
-                session.close()
-                
+                self._dbEngine.writeQueue.deletePolygon(polygon.id)
                 self._cache.removePolygon(polygon.id)
                 
                 player.play_sound(player.location, "random.anvil_break")
@@ -166,8 +292,8 @@ class Polygons(Plugin):
             location = block.location
 
             if block.type in CONTAINERS:
-                polygon = self._cache.findPolygonAtPosition(
-                    location.dimension.name, location.x, location.z, location.y
+                polygon = self._cache.findPolygonForPlayer(
+                    player.name, location.dimension.name, location.x, location.z, location.y
                 )
                 
                 if polygon:
@@ -180,3 +306,60 @@ class Polygons(Plugin):
                         
         except:
             return
+
+    @event_handler()
+    def playerJoin(self, event: PlayerJoinEvent):
+        self._cache.onlinePlayers.add(event.player.name)
+        if self._cache.tiles:
+            self._cache.tiles.pinOwner(event.player.name)
+
+    @event_handler()
+    def playerQuit(self, event: PlayerQuitEvent):
+        self._cache.onlinePlayers.remove(event.player.name)
+        self._cache.forgetPlayer(event.player.name)
+        if self._cache.tiles:
+            self._cache.tiles.unpinOwner(event.player.name)
+        self._borderRenderer.forgetPlayer(event.player.name)
+
+    @event_handler(priority=EventPriority.HIGHEST)
+    def explodeActor(self, event: ActorExplodeEvent):
+        blocks = event.block_list
+        if not blocks:
+            return
+        
+        polygons = self._cache.findPolygonsAtPositions(
+            event.location.dimension.name, [(block.x, block.y, block.z) for block in blocks]
+        )
+        
+        allowed = [block for block, polygon in zip(blocks, polygons) if polygon is None or polygon.allowExplosions]
+        if len(allowed) != len(blocks):
+            event.block_list = allowed
+
+    @event_handler(priority=EventPriority.HIGHEST)
+    def extendPiston(self, event: BlockPistonExtendEvent):
+        self._protectFromPiston(event, PISTON_PUSH_LIMIT + 1)
+
+    @event_handler(priority=EventPriority.HIGHEST)
+    def retractPiston(self, event: BlockPistonRetractEvent):
+        self._protectFromPiston(event, 2)
+
+    def _protectFromPiston(self, event: BlockPistonEvent, distance: int):
+        block = event.block
+        offsetX, offsetY, offsetZ = PISTON_OFFSETS[event.direction]
+        
+        positions = [(block.x, block.y, block.z)]
+        positions.extend(
+            (block.x + offsetX * step, block.y + offsetY * step, block.z + offsetZ * step)
+            for step in range(1, distance + 1)
+        )
+        
+        polygons = self._cache.findPolygonsAtPositions(block.dimension.name, positions)
+        if self._cache.tiles and any(polygon is self._cache.tiles.pending for polygon in polygons):
+            event.is_cancelled = True
+            return
+
+        piston, *affected = polygons
+        for polygon in affected:
+            if polygon is not None and (piston is None or polygon.id != piston.id):
+                event.is_cancelled = True
+                return
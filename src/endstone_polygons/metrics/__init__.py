@@ -0,0 +1,4 @@
+from endstone_polygons.metrics.histogram import Histogram
+from endstone_polygons.metrics.metrics import Metrics, timedOperation
+
+__all__ = ["Histogram", "Metrics", "timedOperation"]
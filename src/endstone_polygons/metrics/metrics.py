@@ -0,0 +1,99 @@
+from functools import wraps
+from time import perf_counter_ns, monotonic
+from typing import Callable
+
+from .histogram import Histogram, LATENCY_BOUNDS, COUNT_BOUNDS
+
+
+def formatDuration(nanoseconds: float) -> str:
+    if nanoseconds >= 1_000_000:
+        return f"{nanoseconds / 1_000_000:.2f}ms"
+    return f"{nanoseconds / 1_000:.1f}µs"
+
+
+def timedOperation(function: Callable) -> Callable:
+    name = function.__name__
+
+    @wraps(function)
+    def wrapper(self, *args, **kwargs):
+        metrics = self.session.info.get("metrics")
+        if metrics is None:
+            return function(self, *args, **kwargs)
+
+        start = perf_counter_ns()
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            metrics.recordDatabase(name, perf_counter_ns() - start)
+
+    return wrapper
+
+
+class Metrics:
+    def __init__(self):
+        self.handlers: dict[str, Histogram] = {}
+        self.cancelled: dict[str, int] = {}
+        self.candidates = {"point": Histogram(COUNT_BOUNDS), "box": Histogram(COUNT_BOUNDS)}
+        self.database: dict[str, Histogram] = {}
+
+        self.startedAt = monotonic()
+
+    def timeHandler(self, name: str, handler: Callable) -> Callable:
+        histogram = self.handlers.setdefault(name, Histogram(LATENCY_BOUNDS))
+        self.cancelled.setdefault(name, 0)
+
+        @wraps(handler)
+        def wrapper(event):
+            start = perf_counter_ns()
+            try:
+                handler(event)
+            finally:
+                histogram.record(perf_counter_ns() - start)
+                if event.is_cancelled:
+                    self.cancelled[name] += 1
+
+        return wrapper
+
+    def recordCandidates(self, kind: str, count: int):
+        self.candidates[kind].record(count)
+
+    def recordDatabase(self, name: str, duration: int):
+        histogram = self.database.get(name)
+        if histogram is None:
+            histogram = self.database[name] = Histogram(LATENCY_BOUNDS)
+        histogram.record(duration)
+
+    def reset(self):
+        for histogram in (*self.handlers.values(), *self.candidates.values(), *self.database.values()):
+            histogram.reset()
+        for name in self.cancelled:
+            self.cancelled[name] = 0
+
+        self.startedAt = monotonic()
+
+    def summary(self) -> list[str]:
+        lines = [f"Collected over {monotonic() - self.startedAt:.0f}s"]
+
+        for name, histogram in self.handlers.items():
+            lines.append(
+                f"{name}: {histogram.count} calls, {self.cancelled[name]} cancelled, "
+                f"p50 {formatDuration(histogram.percentile(0.5))}, "
+                f"p99 {formatDuration(histogram.percentile(0.99))}, "
+                f"max {formatDuration(histogram.max)}"
+            )
+
+        for kind, histogram in self.candidates.items():
+            lines.append(
+                f"Spatial {kind} queries: {histogram.count}, "
+                f"candidates mean {histogram.mean:.2f}, p99 {histogram.percentile(0.99)}, max {histogram.max}"
+            )
+
+        for name, histogram in sorted(self.database.items()):
+            lines.append(
+                f"Database {name}: {histogram.count} calls, "
+                f"mean {formatDuration(histogram.mean)}, "
+                f"p99 {formatDuration(histogram.percentile(0.99))}, "
+                f"max {formatDuration(histogram.max)}"
+            )
+
+        return lines
@@ -131,6 +131,10 @@ class CommandBuilder:
             self.__permissions.update(command.getPermissions())
         return self
     
+    def addPermission(self, permission: Permission) -> Self:
+        self.__permissions[permission.name] = permission.toDict()
+        return self
+    
     @property
     def commands(self) -> dict[str, dict[str, Any]]:
         return self.__commands
@@ -0,0 +1,3 @@
+from endstone_polygons.visual.borderRenderer import BorderRenderer
+
+__all__ = ["BorderRenderer"]
@@ -0,0 +1,155 @@
+from collections import deque
+from math import sqrt
+from typing import Optional
+
+from endstone import Player
+from endstone.plugin import Plugin
+from endstone.scheduler import Task
+
+from ..cache import PolygonRecord
+
+
+class BorderRenderer:
+    def __init__(self, plugin: Plugin, config: dict):
+        borderConfig: dict = config.get("border", {})
+
+        self._plugin = plugin
+        self.particle: str = borderConfig.get("particle", "ll:pointP1")
+        self.budget: int = borderConfig.get("budget", 200)
+        self.viewDistance: float = borderConfig.get("viewDistance", 48)
+        self.spacing: float = borderConfig.get("spacing", 1)
+        self.farSpacing: float = borderConfig.get("farSpacing", 4)
+        self.duration: int = int(borderConfig.get("duration", 20) * 20)
+        self.refresh: int = max(1, int(borderConfig.get("refresh", 2) * 20))
+
+        self._borders: dict[str, dict[int, list]] = {}
+        self._pending: dict[str, deque] = {}
+        self._tick = 0
+        self._task: Optional[Task] = None
+
+    def start(self):
+        self._task = self._plugin.server.scheduler.run_task(self._plugin, self._onTick, delay=1, period=1)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        self._borders.clear()
+        self._pending.clear()
+
+    def show(self, player: Player, polygon: PolygonRecord, duration: Optional[int] = None):
+        bounds = (polygon.minX, polygon.minY, polygon.minZ, polygon.maxX + 1, polygon.maxY + 1, polygon.maxZ + 1)
+        expiresAt = self._tick + (self.duration if duration is None else duration)
+
+        self._borders.setdefault(player.name, {})[polygon.id] = [bounds, expiresAt, self._tick]
+
+    def hide(self, playerName: str, polygonId: Optional[int] = None):
+        borders = self._borders.get(playerName)
+        if borders is None:
+            return
+
+        if polygonId is None:
+            borders.clear()
+        else:
+            borders.pop(polygonId, None)
+
+        if not borders:
+            del self._borders[playerName]
+            self._pending.pop(playerName, None)
+
+    def forgetPlayer(self, playerName: str):
+        self._borders.pop(playerName, None)
+        self._pending.pop(playerName, None)
+
+    def _onTick(self):
+        self._tick += 1
+        if not self._borders and not self._pending:
+            return
+
+        server = self._plugin.server
+        players: dict[str, Player] = {}
+
+        for name in list(self._borders):
+            player = server.get_player(name)
+            if player is None:
+                self.forgetPlayer(name)
+                continue
+            players[name] = player
+
+            borders = self._borders[name]
+            idle = not self._pending.get(name)
+            for polygonId, border in list(borders.items()):
+                bounds, expiresAt, drawAt = border
+                if expiresAt <= self._tick:
+                    del borders[polygonId]
+                    continue
+
+                if idle and drawAt <= self._tick:
+                    points = self._pending.setdefault(name, deque())
+                    points.extend(self._edgePoints(bounds, player.location))
+                    border[2] = self._tick + self.refresh
+
+            if not borders:
+                del self._borders[name]
+
+        self._spawn(players)
+
+    def _spawn(self, players: dict[str, Player]):
+        budget = self.budget
+        while budget > 0 and self._pending:
+            share = max(1, budget // len(self._pending))
+
+            for name in list(self._pending):
+                points = self._pending[name]
+                player = players.get(name)
+                if player is None:
+                    del self._pending[name]
+                    continue
+
+                for _ in range(min(share, len(points), budget)):
+                    x, y, z = points.popleft()
+                    player.spawn_particle(self.particle, x, y, z)
+                    budget -= 1
+
+                if not points:
+                    del self._pending[name]
+                if budget <= 0:
+                    return
+
+    def _spacingAt(self, distance: float) -> float:
+        return self.spacing + (self.farSpacing - self.spacing) * min(distance / self.viewDistance, 1.0)
+
+    def _edgePoints(self, bounds: tuple, location) -> list[tuple]:
+        minX, minY, minZ, maxX, maxY, maxZ = bounds
+        playerX, playerY, playerZ = location.x, location.y, location.z
+        viewDistance = self.viewDistance
+
+        edges = []
+        for y in (minY, maxY):
+            for z in (minZ, maxZ):
+                edges.append(((minX, y, z), (maxX, y, z)))
+            for x in (minX, maxX):
+                edges.append(((x, y, minZ), (x, y, maxZ)))
+        for x in (minX, maxX):
+            for z in (minZ, maxZ):
+                edges.append(((x, minY, z), (x, maxY, z)))
+
+        points = []
+        for start, end in edges:
+            axis = 0 if start[0] != end[0] else 1 if start[1] != end[1] else 2
+            offsetX = max(start[0] - playerX, 0, playerX - end[0])
+            offsetY = max(start[1] - playerY, 0, playerY - end[1])
+            offsetZ = max(start[2] - playerZ, 0, playerZ - end[2])
+            if sqrt(offsetX * offsetX + offsetY * offsetY + offsetZ * offsetZ) > viewDistance:
+                continue
+
+            point = list(start)
+            while point[axis] <= end[axis]:
+                distance = sqrt((point[0] - playerX) ** 2 + (point[1] - playerY) ** 2 + (point[2] - playerZ) ** 2)
+                if distance <= viewDistance:
+                    points.append((point[0], point[1], point[2]))
+                point[axis] += self._spacingAt(distance)
+
+        points.sort(key=lambda point: (point[0] - playerX) ** 2 + (point[1] - playerY) ** 2 + (point[2] - playerZ) ** 2)
+        return points
@@ -0,0 +1,18 @@
+import sys
+
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from endstone_polygons.database.engine import DatabaseEngine
+
+
+@pytest.fixture
+def dbEngine(tmp_path):
+    path = tmp_path / "polygons.db"
+    engine = DatabaseEngine({"database": {"type": "sqlite", "sqlite": {"filename": str(path)}}}, str(path))
+    engine.createTables()
+    yield engine
+    engine.close()
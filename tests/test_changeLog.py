@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from endstone_polygons.database.models import PolygonChange
+from endstone_polygons.database.repository import PolygonRepository
+
+
+def _createPolygon(repository: PolygonRepository, name: str):
+    return repository.createPolygon(name, "owner", "overworld", 0, 64, 0, -5, 60, -5, 5, 70, 5)
+
+
+def _changeCount(repository: PolygonRepository) -> int:
+    return repository.session.execute(select(func.count(PolygonChange.id))).scalar()
+
+
+def testChangesAreNotLoggedWithoutSync(dbEngine):
+    for index in range(50):
+        session = dbEngine.getSession()
+        repository = PolygonRepository(session)
+
+        polygon = _createPolygon(repository, f"claim{index}")
+        repository.addMember(polygon.id, "friend")
+        repository.updatePolygonFlags(polygon.id, canBreak=True)
+        repository.deletePolygon(polygon.id)
+        session.close()
+
+    session = dbEngine.getSession()
+    assert _changeCount(PolygonRepository(session)) == 0
+    session.close()
+
+
+def testChangesAreLoggedWithSync(dbEngine):
+    dbEngine.enableChangeLog()
+    session = dbEngine.getSession()
+    repository = PolygonRepository(session)
+
+    polygon = _createPolygon(repository, "claim")
+    repository.deletePolygon(polygon.id)
+
+    assert [change.action for change in repository.getChanges(0)] == ["create", "delete"]
+    session.close()
+
+
+def testPruneChangesKeepsRecentEntries(dbEngine):
+    dbEngine.enableChangeLog()
+    session = dbEngine.getSession()
+    repository = PolygonRepository(session)
+
+    _createPolygon(repository, "claim")
+    session.add(PolygonChange(polygonId=1, action="update", createdAt=datetime.utcnow() - timedelta(hours=2)))
+    session.commit()
+
+    assert repository.pruneChanges(datetime.utcnow() - timedelta(hours=1)) == 1
+    assert _changeCount(repository) == 1
+    session.close()
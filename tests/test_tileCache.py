@@ -0,0 +1,116 @@
+import logging
+
+import pytest
+
+from endstone_polygons.cache import PolygonCache, TileCache
+from endstone_polygons.database.repository import PolygonRepository
+
+
+WORLD = "overworld"
+
+
+class FakeScheduler:
+    def run_task(self, plugin, task, delay=0, period=0):
+        return None
+
+
+class FakeServer:
+    online_players = []
+    scheduler = FakeScheduler()
+
+
+class FakePlugin:
+    server = FakeServer()
+    logger = logging.getLogger("polygons")
+
+
+def _claim(name: str, owner: str, x: int, z: int) -> dict:
+    return {
+        "name": name, "owner": owner, "world": WORLD,
+        "centerX": x, "centerY": 64, "centerZ": z,
+        "minX": x - 3, "minY": 0, "minZ": z - 3, "maxX": x + 3, "maxY": 128, "maxZ": z + 3
+    }
+
+
+def _createCache(dbEngine, missPolicy: str) -> PolygonCache:
+    session = dbEngine.getSession()
+    repository = PolygonRepository(session)
+    repository.createPolygons(
+        [_claim(f"home{index}", "alice", index * 16, 0) for index in range(200)] +
+        [_claim("farm", "bob", 5000, 5000)]
+    )
+    session.close()
+
+    config = {"cache": {"lazy": {"memoryBudget": 0.1, "missPolicy": missPolicy}}}
+    cache = PolygonCache(logging.getLogger("polygons"), config)
+    cache.tiles = TileCache(FakePlugin(), dbEngine, cache, config)
+
+    cache.tiles.pinOwner("alice")
+    _load(cache.tiles, ("owner", "alice"))
+    return cache
+
+
+def _load(tiles: TileCache, item: tuple):
+    tiles._fetched += 1
+    tiles._apply(item, *tiles._fetch(item))
+
+
+@pytest.mark.parametrize("missPolicy", ["load", "deny"])
+def testLookupSurvivesLowBudget(dbEngine, missPolicy):
+    cache = _createCache(dbEngine, missPolicy)
+    assert len(cache.getPolygonIdsByOwner("alice")) == 200
+
+    polygon = cache.findPolygonAtPosition(WORLD, 5000, 5000, 64)
+    if missPolicy == "deny":
+        assert polygon is cache.tiles.pending
+        _load(cache.tiles, ("tile", (cache.getWorldId(WORLD), 5000 // 512, 5000 // 512)))
+        polygon = cache.findPolygonAtPosition(WORLD, 5000, 5000, 64)
+
+    assert polygon is not None and polygon.name == "farm"
+    assert cache.tiles.stats()["evictions"] == 0
+
+
+def testTilesAwayFromLookupsAreEvicted(dbEngine):
+    cache = _createCache(dbEngine, "load")
+
+    for index in range(10):
+        assert cache.findPolygonAtPosition(WORLD, 20000 + index * 512, 0, 64) is None
+
+    stats = cache.tiles.stats()
+    assert stats["evictions"] > 0
+    assert stats["memory"] - stats["pinned"] * cache.tiles.polygonBytes <= stats["budget"] + cache.tiles.tileBytes
+    assert cache.findPolygonAtPosition(WORLD, 0, 0, 64).name == "home0"
+
+
+class FakeWriteQueue:
+    queued = 0
+    written = 0
+
+
+def testTombstonesExpireAfterLoadsAndWrites(dbEngine, monkeypatch):
+    cache = _createCache(dbEngine, "load")
+    tiles = cache.tiles
+    polygon = cache.findPolygonAtPosition(WORLD, 5000, 5000, 64)
+
+    writeQueue = FakeWriteQueue()
+    monkeypatch.setattr(dbEngine, "writeQueue", writeQueue)
+    item = ("tile", (cache.getWorldId(WORLD), 5000 // 512, 5000 // 512))
+    tiles._fetched += 1
+    rows, members = tiles._fetch(item)
+
+    writeQueue.queued += 1
+    cache.removePolygon(polygon.id)
+
+    tiles._pruneTombstones()
+    assert polygon.id in tiles._removed
+
+    writeQueue.written += 1
+    tiles._pruneTombstones()
+    assert polygon.id in tiles._removed
+
+    tiles.tiles.pop(item[1])
+    tiles._apply(item, rows, members)
+    assert polygon.id not in cache.polygons
+
+    tiles._pruneTombstones()
+    assert not tiles._removed